@@ -21,6 +21,12 @@ from lsprotocol.types import (
     WorkspaceEdit,
 )
 
+# Diagnostic message patterns: a quoted field name, and a file path after
+# "File not found:" or after any colon when it ends in .py
+_QUOTED_FIELD_RE = re.compile(r"['\"](\w+)['\"]")
+_FILE_NOT_FOUND_RE = re.compile(r"File not found:\s*(.+)$")
+_PY_PATH_RE = re.compile(r":\s*(.+\.py)$")
+
 
 def _ranges_overlap(range1: Range, range2: Range) -> bool:
     """Check if two ranges overlap.
@@ -54,7 +60,7 @@ def _extract_field_name_from_message(message: str) -> str | None:
         The field name if found, None otherwise.
     """
     # Try to match patterns like "Missing required field 'goal'" or "Missing 'goal' field"
-    match = re.search(r"['\"](\w+)['\"]", message)
+    match = _QUOTED_FIELD_RE.search(message)
     if match:
         return match.group(1)
     return None
@@ -70,11 +76,11 @@ def _extract_file_path_from_message(message: str) -> str | None:
         The file path if found, None otherwise.
     """
     # Try to match patterns like "File not found: src/module.py"
-    match = re.search(r"File not found:\s*(.+)$", message)
+    match = _FILE_NOT_FOUND_RE.search(message)
     if match:
         return match.group(1).strip()
     # Try other patterns with file paths
-    match = re.search(r":\s*(.+\.py)$", message)
+    match = _PY_PATH_RE.search(message)
     if match:
         return match.group(1).strip()
     return None
@@ -5,10 +5,15 @@ requests to navigate from artifact references to their definitions in source
 files or manifests.
 """
 
-import json
+import asyncio
+import os
 import re
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
-from urllib.parse import urlparse
+from typing import Any, NamedTuple
 
 from lsprotocol.types import (
     DefinitionParams,
@@ -18,9 +23,146 @@ from lsprotocol.types import (
 )
 from pygls.workspace import TextDocument
 
-from maid_lsp.utils.ast_parser import find_artifact_definition
+from maid_lsp.utils import fast_json
+from maid_lsp.utils.ast_parser import ArtifactLocation, find_artifact_definition
+from maid_lsp.utils.debounce import Debouncer, wait_superseded
+from maid_lsp.utils.text import line_at, word_at
+from maid_lsp.utils.uri import is_manifest_file, path_to_uri, uri_to_path
 from maid_lsp.validation.runner import MaidRunner
 
+# Maximum number of manifest name indexes kept in memory per handler
+_MANIFEST_CACHE_SIZE = 128
+
+# Maximum number of source file definition lookups kept in memory per handler
+_SOURCE_DEFINITION_CACHE_SIZE = 256
+
+# Seconds a resolved manifest source path is trusted without re-checking the disk
+_SOURCE_PATH_TTL = 5.0
+
+# Milliseconds a definition request waits for a newer one on the same document
+_REQUEST_DEBOUNCE_MS = 20.0
+
+# JSON tokens that determine structure, in one pass: a "name" key with its string
+# value (group 1), any other object key (group 2), a string value (no group) and
+# container brackets (group 3)
+_JSON_TOKEN_RE = re.compile(
+    rb'"name"\s*:\s*("(?:[^"\\]|\\.)*")'
+    rb'|"((?:[^"\\]|\\.)*)"\s*:'
+    rb'|"(?:[^"\\]|\\.)*"'
+    rb"|([\[\]{}])"
+)
+
+# Container path of an object inside expectedArtifacts.contains
+_ARTIFACT_PATH = [None, b"expectedArtifacts", b"contains", None]
+
+
+def _build_name_index(data: bytes) -> dict[str, tuple[int, int, int]]:
+    """Index the location of every artifact "name" field in a manifest.
+
+    Tokenizes the raw manifest bytes with a single regex pass and tracks the
+    container path so that only the "name" keys of objects in
+    expectedArtifacts.contains are recorded, not the names of arguments or other
+    nested fields. Line numbers are counted incrementally between matches.
+
+    Args:
+        data: The raw manifest file contents.
+
+    Returns:
+        Mapping of artifact name to (line, start column, end column) of its
+        quoted value.
+    """
+    index: dict[str, tuple[int, int, int]] = {}
+    path: list[bytes | None] = []
+    pending_key: bytes | None = None
+    line_num = 0
+    counted_to = 0
+
+    for match in _JSON_TOKEN_RE.finditer(data):
+        group = match.lastindex
+        if group == 2:
+            pending_key = match.group(2)
+            continue
+        if group == 1 and path == _ARTIFACT_PATH:
+            value = match.group(1)
+            name = value[1:-1].decode("utf-8")
+            if b"\\" not in value and name not in index:
+                value_start = match.start(1)
+                line_num += data.count(b"\n", counted_to, value_start)
+                counted_to = value_start
+                line_start = data.rfind(b"\n", 0, value_start) + 1
+                column = len(data[line_start:value_start].decode("utf-8"))
+                index[name] = (line_num, column, column + len(name) + 2)
+        elif group == 3:
+            if match.group(3) in b"{[":
+                path.append(pending_key)
+            elif path:
+                path.pop()
+        pending_key = None
+    return index
+
+
+@lru_cache(maxsize=1024)
+def _find_project_root_cached(manifest_path: Path) -> Path:
+    """Find the project root directory for a manifest file (memoized).
+
+    Args:
+        manifest_path: Path to the manifest file.
+
+    Returns:
+        The project root directory.
+    """
+    # Walk up the path looking for 'manifests' directory
+    for parent in manifest_path.parents:
+        if parent.name == "manifests":
+            return parent.parent
+    # Fallback: use the manifest's parent directory
+    return manifest_path.parent
+
+
+class _ArtifactsView(NamedTuple):
+    """The expectedArtifacts fields of a manifest, normalized once."""
+
+    contains: list[Any]
+    source_file: str | None
+
+
+def _artifacts_view(manifest: dict[str, Any]) -> _ArtifactsView:
+    """Extract the expectedArtifacts contents and source file of a manifest.
+
+    Args:
+        manifest: The parsed manifest dictionary.
+
+    Returns:
+        The artifact list (empty if missing or malformed) and the source file
+        path, or None if not declared.
+    """
+    expected_artifacts = manifest.get("expectedArtifacts")
+    if not isinstance(expected_artifacts, dict):
+        return _ArtifactsView([], None)
+
+    contains = expected_artifacts.get("contains")
+    source_file = expected_artifacts.get("file")
+    return _ArtifactsView(
+        contains if isinstance(contains, list) else [],
+        source_file if isinstance(source_file, str) and source_file else None,
+    )
+
+
+class _CachedManifest(NamedTuple):
+    """The artifact name index of a manifest and the file state it was read from."""
+
+    mtime_ns: int
+    name_index: dict[str, tuple[int, int, int]]
+
+
+class _DefinitionTarget(NamedTuple):
+    """An artifact declared in a manifest and the source file that defines it."""
+
+    source_path: Path
+    artifact_type: str
+    artifact_name: str
+    class_name: str | None
+
 
 class DefinitionHandler:
     """Handles go-to-definition requests.
@@ -38,6 +180,17 @@ class DefinitionHandler:
                 If None, creates a new instance.
         """
         self.runner = runner if runner is not None else MaidRunner()
+        self._manifest_cache: OrderedDict[Path, _CachedManifest] = OrderedDict()
+        self._manifest_cache_lock = threading.Lock()
+        # (manifest path, source file string) -> (expiry time, resolved path)
+        self._source_path_cache: dict[tuple[Path, str], tuple[float, Path | None]] = {}
+        # (source mtime_ns, target) -> definition found by the AST parser
+        self._source_definition_cache: OrderedDict[
+            tuple[int, _DefinitionTarget], ArtifactLocation | None
+        ] = OrderedDict()
+        self._source_definition_lock = threading.Lock()
+        # Coalesces the requests a client fires while the cursor moves
+        self._debouncer = Debouncer(_REQUEST_DEBOUNCE_MS)
 
     def get_definition(
         self, params: DefinitionParams, document: TextDocument
@@ -55,12 +208,16 @@ class DefinitionHandler:
         if not document.source:
             return None
 
+        word = self._get_word_at_position(document, params.position)
+        if not word:
+            return None
+
         uri = params.text_document.uri
         file_path = self._uri_to_path(uri)
 
         # Determine if we're in a manifest or source file
         if self._is_manifest_file(file_path):
-            return self._get_definition_from_manifest(params, document, file_path)
+            return self._get_definition_from_manifest(word, document.source, file_path)
         else:
             # For source files, we need async but LSP handlers can be sync
             # Return None for now - will be handled in async wrapper
@@ -77,67 +234,155 @@ class DefinitionHandler:
 
         Returns:
             A Location or list of Locations pointing to the definition,
-            or None if no definition found.
+            or None if no definition found or a newer request for the same
+            document superseded this one.
         """
         if not document.source:
             return None
 
+        # Extract the word once; clicks on whitespace or punctuation end here
+        word = self._get_word_at_position(document, params.position)
+        if not word:
+            return None
+
         uri = params.text_document.uri
         file_path = self._uri_to_path(uri)
 
+        # A newer request for the same document supersedes this one while it waits
+        if await wait_superseded(self._debouncer, uri):
+            return None
+
         # Determine if we're in a manifest or source file
         if self._is_manifest_file(file_path):
-            return self._get_definition_from_manifest(params, document, file_path)
+            return await self._get_definition_from_manifest_async(word, document.source, file_path)
         else:
-            return await self._get_definition_from_source_async(params, document, file_path)
+            return await self._get_definition_from_source_async(word, file_path)
 
     def _get_definition_from_manifest(
-        self, params: DefinitionParams, document: TextDocument, manifest_path: Path
+        self, word: str, source: str, manifest_path: Path
     ) -> Location | None:
         """Get definition location when clicking on artifact in manifest.
 
         Args:
-            params: The definition parameters.
-            document: The manifest document.
+            word: The word under the cursor.
+            source: The manifest document text.
             manifest_path: Path to the manifest file.
 
         Returns:
             Location pointing to source file definition, or None.
         """
-        # Get word at cursor position
-        word = self._get_word_at_position(document, params.position)
-        if not word:
+        target = self._get_manifest_definition_target(word, source, manifest_path)
+        if target is None:
+            return None
+        return self._find_definition_in_source(target)
+
+    async def _get_definition_from_manifest_async(
+        self, word: str, source: str, manifest_path: Path
+    ) -> Location | None:
+        """Get definition location when clicking on artifact in manifest (async).
+
+        The manifest document is parsed and the source file searched in a worker
+        thread, so large files don't block the event loop.
+
+        Args:
+            word: The word under the cursor.
+            source: The manifest document text.
+            manifest_path: Path to the manifest file.
+
+        Returns:
+            Location pointing to source file definition, or None.
+        """
+        # Clicks on words that can't be artifact names don't need the thread hop
+        if f'"{word}"' not in source:
+            return None
+        return await asyncio.to_thread(
+            self._get_definition_from_manifest, word, source, manifest_path
+        )
+
+    def _get_manifest_definition_target(
+        self, word: str, source: str, manifest_path: Path
+    ) -> _DefinitionTarget | None:
+        """Identify the artifact under the cursor in a manifest and its source file.
+
+        Args:
+            word: The word under the cursor.
+            source: The manifest document text.
+            manifest_path: Path to the manifest file.
+
+        Returns:
+            The artifact to look up and the source file declaring it, or None.
+        """
+        # Artifact names are identifiers, so a declared artifact always appears
+        # verbatim as a JSON string. Skip the full parse when it can't be there.
+        if f'"{word}"' not in source:
             return None
 
         # Parse manifest and find artifact
         try:
-            manifest = json.loads(document.source)
-        except json.JSONDecodeError:
+            manifest = fast_json.loads(source)
+        except fast_json.JSONDecodeError:
+            return None
+
+        if not isinstance(manifest, dict):
             return None
 
-        artifact = self._find_artifact_by_name(manifest, word)
+        view = _artifacts_view(manifest)
+        artifact = self._find_artifact_in_contains(view.contains, word)
         if artifact is None:
             return None
 
+        # The target is a cache key, so malformed (e.g. list) fields can't be used
+        artifact_type = artifact.get("type", "")
+        class_name = artifact.get("class")
+        if not isinstance(artifact_type, str) or not (
+            class_name is None or isinstance(class_name, str)
+        ):
+            return None
+
         # Get source file path from manifest
-        expected_artifacts = manifest.get("expectedArtifacts", {})
-        source_file_str = expected_artifacts.get("file")
+        source_file_str = view.source_file
         if not source_file_str:
             return None
 
         # Resolve source file path relative to manifest
         source_file_path = self._resolve_source_path(manifest_path, source_file_str)
-        if not source_file_path or not source_file_path.exists():
+        if not source_file_path:
             return None
 
-        # Find artifact in source file
-        artifact_type = artifact.get("type", "")
-        artifact_name = artifact.get("name", "")
-        class_name = artifact.get("class")
+        return _DefinitionTarget(source_file_path, artifact_type, word, class_name)
 
-        location = find_artifact_definition(
-            source_file_path, artifact_type, artifact_name, class_name
-        )
+    def _find_definition_in_source(self, target: _DefinitionTarget) -> Location | None:
+        """Find an artifact definition in its source file.
+
+        Results are cached per source file version, so repeated navigation to
+        the same symbol doesn't re-parse the file. Safe to call from worker
+        threads.
+
+        Args:
+            target: The artifact and the source file to search.
+
+        Returns:
+            Location of the definition, or None if not found.
+        """
+        try:
+            mtime_ns = target.source_path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+        key = (mtime_ns, target)
+        location: ArtifactLocation | None = None
+        with self._source_definition_lock:
+            hit = key in self._source_definition_cache
+            if hit:
+                self._source_definition_cache.move_to_end(key)
+                location = self._source_definition_cache[key]
+
+        if not hit:
+            location = find_artifact_definition(*target)
+            with self._source_definition_lock:
+                self._source_definition_cache[key] = location
+                if len(self._source_definition_cache) > _SOURCE_DEFINITION_CACHE_SIZE:
+                    self._source_definition_cache.popitem(last=False)
 
         if location is None:
             return None
@@ -151,23 +396,17 @@ class DefinitionHandler:
         )
 
     async def _get_definition_from_source_async(
-        self, params: DefinitionParams, document: TextDocument, source_path: Path
+        self, word: str, source_path: Path
     ) -> Location | None:
         """Get definition location when clicking on artifact in source file (async).
 
         Args:
-            params: The definition parameters.
-            document: The source file document.
+            word: The word under the cursor.
             source_path: Path to the source file.
 
         Returns:
             Location pointing to manifest definition, or None.
         """
-        # Get word at cursor position
-        word = self._get_word_at_position(document, params.position)
-        if not word:
-            return None
-
         # Find manifests that reference this file
         # Convert absolute path to relative path for maid manifests command
         # (maid manifests works better with relative paths)
@@ -185,89 +424,140 @@ class DefinitionHandler:
         except Exception:
             return None
 
-        # Search manifests for artifact definition
-        for manifest_path in manifests:
-            if not manifest_path.exists():
-                continue
-
-            try:
-                with open(manifest_path, encoding="utf-8") as f:
-                    manifest_content = f.read()
-                manifest = json.loads(manifest_content)
-            except (OSError, json.JSONDecodeError):
-                continue
-
-            # Check if this manifest defines the artifact
-            artifact_location = self._find_artifact_location_in_manifest(
-                manifest, manifest_path, word
-            )
-            if artifact_location:
-                return artifact_location
+        # A single candidate that is already cached (the common case) only costs a
+        # stat and a dict lookup, which is cheaper inline than on a worker thread.
+        # Anything that still needs reading and parsing stays off the event loop.
+        if len(manifests) == 1:
+            with self._manifest_cache_lock:
+                cached = manifests[0] in self._manifest_cache
+            if cached:
+                return self._scan_manifest_sync(manifests[0], word)
+
+        # Search manifests for artifact definition, loading them concurrently.
+        # Results are consumed in manifest order so the first defining manifest wins.
+        tasks = [
+            asyncio.ensure_future(asyncio.to_thread(self._scan_manifest_sync, manifest_path, word))
+            for manifest_path in manifests
+        ]
+        try:
+            for task in tasks:
+                artifact_location = await task
+                if artifact_location:
+                    return artifact_location
+        finally:
+            for task in tasks:
+                task.cancel()
 
         return None
 
-    def _find_artifact_location_in_manifest(
-        self, manifest: dict, manifest_path: Path, artifact_name: str
-    ) -> Location | None:
-        """Find the location of an artifact definition in a manifest.
+    def _scan_manifest_sync(self, manifest_path: Path, word: str) -> Location | None:
+        """Load a manifest and look up an artifact definition in it.
+
+        Runs in a worker thread so blocking file I/O doesn't stall the event loop.
 
         Args:
-            manifest: The parsed manifest dictionary.
             manifest_path: Path to the manifest file.
-            artifact_name: Name of the artifact to find.
+            word: Name of the artifact to find.
 
         Returns:
-            Location pointing to artifact in manifest, or None.
+            Location pointing to the artifact in the manifest, or None.
         """
-        expected_artifacts = manifest.get("expectedArtifacts", {})
-        contains = expected_artifacts.get("contains", [])
-        if not isinstance(contains, list):
+        cached = self._load_manifest(manifest_path)
+        if cached is None:
             return None
 
-        # First verify the artifact exists in the manifest
-        artifact_found = False
-        for artifact in contains:
-            if isinstance(artifact, dict) and artifact.get("name") == artifact_name:
-                artifact_found = True
-                break
-
-        if not artifact_found:
+        # Only the "name" fields of expectedArtifacts.contains are indexed
+        position = cached.name_index.get(word)
+        if position is None:
             return None
 
-        # Read manifest file to find line numbers
+        line_num, column, end_column = position
+        return Location(
+            uri=self._path_to_uri(manifest_path),
+            range=Range(
+                start=Position(line=line_num, character=column),
+                end=Position(line=line_num, character=end_column),
+            ),
+        )
+
+    def _load_manifest(self, manifest_path: Path) -> _CachedManifest | None:
+        """Load a manifest's name index, reusing the cached one if the file is unchanged.
+
+        Entries are keyed by path and invalidated when the file's mtime changes.
+        The cache is bounded and evicts the least recently used manifest. Safe to
+        call from worker threads.
+
+        Args:
+            manifest_path: Path to the manifest file.
+
+        Returns:
+            The cached manifest entry, or None if the file can't be read or parsed.
+        """
         try:
-            with open(manifest_path, encoding="utf-8") as f:
-                lines = f.readlines()
+            mtime_ns = manifest_path.stat().st_mtime_ns
         except OSError:
             return None
 
-        # Search for artifact name in manifest content
-        # Escape special regex characters in artifact name
-        pattern = rf'["\']{re.escape(artifact_name)}["\']'
-        for line_num, line in enumerate(lines):
-            # Look for the artifact name in quotes (JSON format)
-            match = re.search(pattern, line)
-            if match:
-                # Check if this is actually in the "name" field of an artifact
-                # Look for "name" field before the artifact name on the same line
-                line_before_match = line[: match.start()]
-                # Check for "name": pattern (with colon) before the match
-                if '"name"' in line_before_match or "'name'" in line_before_match:
-                    column = match.start()
-                    end_column = match.end()
-                    return Location(
-                        uri=self._path_to_uri(manifest_path),
-                        range=Range(
-                            start=Position(line=line_num, character=column),
-                            end=Position(line=line_num, character=end_column),
-                        ),
-                    )
+        with self._manifest_cache_lock:
+            cached = self._manifest_cache.get(manifest_path)
+            if cached is not None and cached.mtime_ns == mtime_ns:
+                self._manifest_cache.move_to_end(manifest_path)
+                return cached
 
-        return None
+        # Read the raw bytes once: the JSON decoder only validates the manifest
+        # and the name index scan consumes the same buffer
+        try:
+            data = manifest_path.read_bytes()
+            if not isinstance(fast_json.loads(data), dict):
+                return None
+            name_index = _build_name_index(data)
+        except (OSError, UnicodeDecodeError, fast_json.JSONDecodeError):
+            return None
+
+        entry = _CachedManifest(mtime_ns, name_index)
+        with self._manifest_cache_lock:
+            self._manifest_cache[manifest_path] = entry
+            self._manifest_cache.move_to_end(manifest_path)
+            if len(self._manifest_cache) > _MANIFEST_CACHE_SIZE:
+                self._manifest_cache.popitem(last=False)
+        return entry
+
+    def clear_path_cache(self) -> None:
+        """Forget resolved source file paths.
+
+        Called when the client reports file system changes so that created,
+        deleted or renamed source files are picked up immediately.
+        """
+        self._source_path_cache.clear()
 
     def _resolve_source_path(self, manifest_path: Path, source_file_str: str) -> Path | None:
         """Resolve source file path relative to manifest location.
 
+        Results, including failed resolutions, are cached for a short time to
+        avoid repeated stat calls when navigating to the same file.
+
+        Args:
+            manifest_path: Path to the manifest file.
+            source_file_str: Source file path from manifest (may be relative).
+
+        Returns:
+            Resolved Path object, or None if resolution fails.
+        """
+        key = (manifest_path, source_file_str)
+        now = time.monotonic()
+        cached = self._source_path_cache.get(key)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+
+        resolved = self._resolve_source_path_uncached(manifest_path, source_file_str)
+        self._source_path_cache[key] = (now + _SOURCE_PATH_TTL, resolved)
+        return resolved
+
+    def _resolve_source_path_uncached(
+        self, manifest_path: Path, source_file_str: str
+    ) -> Path | None:
+        """Resolve source file path by checking candidate locations on disk.
+
         Args:
             manifest_path: Path to the manifest file.
             source_file_str: Source file path from manifest (may be relative).
@@ -283,13 +573,15 @@ class DefinitionHandler:
         if source_path.is_absolute():
             return source_path if source_path.exists() else None
 
+        # Candidates are only normalized for the existence check; the AST parser
+        # resolves symlinks once, for the returned location.
         # Try relative to project root
-        resolved = (project_root / source_path).resolve()
+        resolved = Path(os.path.abspath(project_root / source_path))
         if resolved.exists():
             return resolved
 
         # Try relative to manifest directory
-        resolved = (manifest_path.parent / source_path).resolve()
+        resolved = Path(os.path.abspath(manifest_path.parent / source_path))
         if resolved.exists():
             return resolved
 
@@ -304,12 +596,7 @@ class DefinitionHandler:
         Returns:
             The project root directory.
         """
-        # Walk up the path looking for 'manifests' directory
-        for parent in manifest_path.parents:
-            if parent.name == "manifests":
-                return parent.parent
-        # Fallback: use the manifest's parent directory
-        return manifest_path.parent
+        return _find_project_root_cached(manifest_path)
 
     def _get_word_at_position(self, document: TextDocument, position: Position) -> str | None:
         """Extract the word at the given position.
@@ -321,27 +608,10 @@ class DefinitionHandler:
         Returns:
             The word at the position, or None if not on a word.
         """
-        lines = document.lines if document.lines else document.source.split("\n")
-        line_num = position.line
-
-        if line_num >= len(lines):
+        current_line = line_at(document.source, position.line)
+        if current_line is None:
             return None
-
-        current_line = lines[line_num]
-        char_pos = position.character
-
-        if char_pos > len(current_line):
-            return None
-
-        # Find word boundaries - include underscore as part of word
-        word_pattern = re.compile(r"[a-zA-Z_][a-zA-Z0-9_]*")
-
-        for match in word_pattern.finditer(current_line):
-            start, end = match.span()
-            if start <= char_pos <= end:
-                return match.group()
-
-        return None
+        return word_at(current_line, position.character)
 
     def _find_artifact_by_name(self, manifest: dict, name: str) -> dict | None:
         """Find an artifact by name in the manifest.
@@ -353,14 +623,18 @@ class DefinitionHandler:
         Returns:
             The artifact dictionary if found, or None.
         """
-        expected_artifacts = manifest.get("expectedArtifacts")
-        if not expected_artifacts:
-            return None
+        return self._find_artifact_in_contains(_artifacts_view(manifest).contains, name)
 
-        contains = expected_artifacts.get("contains", [])
-        if not isinstance(contains, list):
-            return None
+    def _find_artifact_in_contains(self, contains: list[Any], name: str) -> dict | None:
+        """Find an artifact by name in an expectedArtifacts.contains list.
+
+        Args:
+            contains: The artifact entries of a manifest.
+            name: The artifact name to find.
 
+        Returns:
+            The artifact dictionary if found, or None.
+        """
         for artifact in contains:
             if isinstance(artifact, dict) and artifact.get("name") == name:
                 return artifact
@@ -376,9 +650,7 @@ class DefinitionHandler:
         Returns:
             True if the file is a manifest file, False otherwise.
         """
-        return file_path.name.endswith(".manifest.json") or (
-            "manifests" in file_path.parts and file_path.suffix == ".json"
-        )
+        return is_manifest_file(file_path)
 
     def _uri_to_path(self, uri: str) -> Path:
         """Convert a file URI to a Path object.
@@ -389,10 +661,7 @@ class DefinitionHandler:
         Returns:
             A Path object.
         """
-        parsed = urlparse(uri)
-        if parsed.scheme == "file":
-            return Path(parsed.path)
-        return Path(uri)
+        return uri_to_path(uri)
 
     def _path_to_uri(self, file_path: Path) -> str:
         """Convert a Path object to a file URI.
@@ -403,4 +672,4 @@ class DefinitionHandler:
         Returns:
             A file URI string.
         """
-        return f"file://{file_path.resolve()}"
+        return path_to_uri(file_path)
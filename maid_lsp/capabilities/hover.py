@@ -5,9 +5,6 @@ to show artifact information, and the format_artifact_hover function
 that formats artifact data as markdown for hover display.
 """
 
-import json
-import re
-
 from lsprotocol.types import (
     Hover,
     HoverParams,
@@ -16,6 +13,9 @@ from lsprotocol.types import (
 )
 from pygls.workspace import TextDocument
 
+from maid_lsp.utils import fast_json
+from maid_lsp.utils.text import line_at, word_at
+
 
 class HoverHandler:
     """Handles hover requests.
@@ -44,16 +44,14 @@ class HoverHandler:
         if not document.source:
             return None
 
-        lines = document.lines if document.lines else document.source.split("\n")
         line_num = params.position.line
         char_pos = params.position.character
 
         # Handle position outside document bounds
-        if line_num >= len(lines):
+        current_line = line_at(document.source, line_num)
+        if current_line is None:
             return None
 
-        current_line = lines[line_num]
-
         # Handle position outside line bounds
         if char_pos > len(current_line):
             return None
@@ -65,8 +63,10 @@ class HoverHandler:
 
         # Try to parse the document as JSON and find artifacts
         try:
-            manifest = json.loads(document.source)
-        except json.JSONDecodeError:
+            manifest = fast_json.loads(document.source)
+        except fast_json.JSONDecodeError:
+            return None
+        if not isinstance(manifest, dict):
             return None
 
         # Look for artifact in expectedArtifacts
@@ -90,18 +90,7 @@ class HoverHandler:
         Returns:
             The word at the position, or None if not on a word.
         """
-        if not line or char_pos < 0 or char_pos > len(line):
-            return None
-
-        # Find word boundaries - include underscore as part of word
-        word_pattern = re.compile(r"[a-zA-Z_][a-zA-Z0-9_]*")
-
-        for match in word_pattern.finditer(line):
-            start, end = match.span()
-            if start <= char_pos <= end:
-                return match.group()
-
-        return None
+        return word_at(line, char_pos)
 
     def _find_artifact_by_name(self, manifest: dict, name: str) -> dict | None:
         """Find an artifact by name in the manifest.
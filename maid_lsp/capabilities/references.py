@@ -6,10 +6,17 @@ test files, and source files.
 """
 
 import ast
-import json
+import asyncio
+import fnmatch
+import mmap
+import os
 import re
+import time
+from collections import defaultdict
+from collections.abc import Callable, Iterator
+from functools import lru_cache
 from pathlib import Path
-from urllib.parse import urlparse
+from typing import Any, NamedTuple
 
 from lsprotocol.types import (
     Location,
@@ -19,9 +26,583 @@ from lsprotocol.types import (
 )
 from pygls.workspace import TextDocument
 
-from maid_lsp.utils.ast_parser import parse_file
+from maid_lsp.utils import fast_json
+from maid_lsp.utils.ast_parser import _definition_types
+from maid_lsp.utils.debounce import Debouncer, wait_superseded
+from maid_lsp.utils.text import line_at, word_at
+from maid_lsp.utils.uri import is_manifest_file, path_to_uri, uri_to_path
 from maid_lsp.validation.runner import MaidRunner
 
+# A JSON string token (keys and values alike) with its raw contents in group 1
+_JSON_STRING_RE = re.compile(r'"((?:[^"\\\n]|\\.)*)"')
+
+# Directories that never contain project source files
+_EXCLUDED_SOURCE_DIRS = frozenset(
+    {
+        "test",
+        "tests",
+        "__pycache__",
+        ".pytest_cache",
+        "build",
+        "dist",
+        ".venv",
+        "venv",
+        "node_modules",
+        ".git",
+    }
+)
+
+
+# Maximum number of files scanned concurrently in worker threads
+_MAX_PARALLEL_SCANS = os.cpu_count() or 4
+
+# Milliseconds a references request waits for a newer one on the same document
+_REQUEST_DEBOUNCE_MS = 20.0
+
+# Directories skipped by the combined workspace walk: caches, virtual environments,
+# vendored packages and build output hold no manifests or sources of the project
+_SKIPPED_WORKSPACE_DIRS = frozenset(
+    {
+        "__pycache__",
+        ".pytest_cache",
+        ".mypy_cache",
+        ".ruff_cache",
+        ".venv",
+        "venv",
+        ".tox",
+        ".nox",
+        ".eggs",
+        "site-packages",
+        "node_modules",
+        ".git",
+        "build",
+        "dist",
+    }
+)
+
+
+# Files smaller than this are read outright; mapping them costs more than the copy
+_MMAP_MIN_SIZE = 16 * 1024
+
+# Directory modification times this recent (in nanoseconds) aren't trusted, since
+# a change within the same timestamp tick would go unnoticed
+_DIRECTORY_SETTLE_NS = 2_000_000_000
+
+
+class _ReferenceIndexer(ast.NodeVisitor):
+    """Indexes the AST nodes that reference each name in a module.
+
+    Handles attribute access, loaded names (which covers calls, since a call's
+    func is itself a Name or Attribute) and imports in a single traversal, so
+    every name in the module is indexed at once.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the indexer."""
+        self.index: defaultdict[str, list[ast.AST]] = defaultdict(list)
+
+    def visit_Attribute(self, node: ast.Attribute) -> None:
+        """Index attribute access by name, then visit the accessed value."""
+        self.index[node.attr].append(node)
+        self.generic_visit(node)
+
+    def visit_Name(self, node: ast.Name) -> None:
+        """Index names that are read or deleted (not assigned)."""
+        if not isinstance(node.ctx, ast.Store):
+            self.index[node.id].append(node)
+
+    def visit_Import(self, node: ast.Import) -> None:
+        """Index import aliases by the name they bind."""
+        for alias in node.names:
+            self.index[alias.asname if alias.asname is not None else alias.name].append(alias)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        """Index imported names."""
+        for alias in node.names:
+            self.index[alias.name].append(alias)
+
+
+def _file_version(path: Path) -> tuple[str, int, int] | None:
+    """Build the cache key identifying the current version of a file.
+
+    Args:
+        path: Path to the file.
+
+    Returns:
+        The path string, modification time in nanoseconds and size, or None if
+        the file can't be stat'ed.
+    """
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return str(path), stat.st_mtime_ns, stat.st_size
+
+
+@lru_cache(maxsize=512)
+def _read_text_cached(
+    path: str,
+    mtime_ns: int,  # noqa: ARG001
+    size: int,  # noqa: ARG001
+) -> str:
+    """Read a text file (memoized per file version).
+
+    The modification time and size are part of the cache key so that an
+    edited file is read again.
+
+    Args:
+        path: Path to the file.
+        mtime_ns: File modification time in nanoseconds.
+        size: File size in bytes.
+
+    Returns:
+        The file contents.
+
+    Raises:
+        OSError: If the file can't be read.
+        UnicodeDecodeError: If the file isn't valid UTF-8.
+    """
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+@lru_cache(maxsize=512)
+def _load_manifest_cached(path: str, mtime_ns: int, size: int) -> dict[str, Any] | None:
+    """Parse a manifest file (memoized per file version).
+
+    Args:
+        path: Path to the manifest file.
+        mtime_ns: File modification time in nanoseconds.
+        size: File size in bytes.
+
+    Returns:
+        The parsed manifest, or None if it isn't a valid JSON object.
+
+    Raises:
+        OSError: If the file can't be read.
+        UnicodeDecodeError: If the file isn't valid UTF-8.
+    """
+    content = _read_text_cached(path, mtime_ns, size)
+    try:
+        manifest = fast_json.loads(content)
+    except fast_json.JSONDecodeError:
+        return None
+    return manifest if isinstance(manifest, dict) else None
+
+
+@lru_cache(maxsize=512)
+def _artifact_names_cached(path: str, mtime_ns: int, size: int) -> frozenset[str]:
+    """Collect the names of the artifacts a manifest declares (memoized per file version).
+
+    Args:
+        path: Path to the manifest file.
+        mtime_ns: File modification time in nanoseconds.
+        size: File size in bytes.
+
+    Returns:
+        The expectedArtifacts names, empty if the manifest isn't valid.
+
+    Raises:
+        OSError: If the file can't be read.
+        UnicodeDecodeError: If the file isn't valid UTF-8.
+    """
+    manifest = _load_manifest_cached(path, mtime_ns, size)
+    if manifest is None:
+        return frozenset()
+    expected_artifacts = manifest.get("expectedArtifacts", {})
+    contains = expected_artifacts.get("contains") if isinstance(expected_artifacts, dict) else None
+    if not isinstance(contains, list):
+        return frozenset()
+    return frozenset(
+        name
+        for artifact in contains
+        if isinstance(artifact, dict) and isinstance(name := artifact.get("name"), str)
+    )
+
+
+@lru_cache(maxsize=512)
+def _manifest_string_index_cached(
+    path: str, mtime_ns: int, size: int
+) -> dict[str, tuple[tuple[int, int, int], ...]]:
+    """Index the string tokens of a manifest by value (memoized per file version).
+
+    The JSON strings are tokenized in a single pass, so keys and values alike are
+    indexed and only strings equal to a name match it, not quoted mentions inside
+    longer strings. Queries for different names on the same file are dictionary
+    lookups.
+
+    Args:
+        path: Path to the manifest file.
+        mtime_ns: File modification time in nanoseconds.
+        size: File size in bytes.
+
+    Returns:
+        Mapping of each raw string value to the (line, start column, end column)
+        ranges of its tokens, quotes included, in file order.
+
+    Raises:
+        OSError: If the file can't be read.
+        UnicodeDecodeError: If the file isn't valid UTF-8.
+    """
+    content = _read_text_cached(path, mtime_ns, size)
+    index: dict[str, list[tuple[int, int, int]]] = {}
+    # Count newlines between tokens to track the line number
+    line_num = 0
+    counted_to = 0
+    for match in _JSON_STRING_RE.finditer(content):
+        start = match.start()
+        line_num += content.count("\n", counted_to, start)
+        counted_to = start
+        column = start - (content.rfind("\n", 0, start) + 1)
+        index.setdefault(match.group(1), []).append(
+            (line_num, column, column + (match.end() - start))
+        )
+    return {value: tuple(ranges) for value, ranges in index.items()}
+
+
+@lru_cache(maxsize=16)
+def _pyproject_package_name_cached(
+    path: str,
+    mtime_ns: int,  # noqa: ARG001
+    size: int,  # noqa: ARG001
+) -> str:
+    """Read the project name from a pyproject.toml, once per file version.
+
+    This is optional - if neither tomli nor tomllib is available, or the file
+    can't be parsed, an empty name is returned and callers fall back to common
+    package locations.
+
+    Args:
+        path: Path to pyproject.toml.
+        mtime_ns: Modification time in nanoseconds (part of the cache key).
+        size: File size in bytes (part of the cache key).
+
+    Returns:
+        The ``project.name`` value, or an empty string if unavailable.
+    """
+    # Try tomli first, then tomllib (Python 3.11+)
+    try:
+        import tomli as toml_parser
+    except ImportError:
+        try:
+            import tomllib as toml_parser
+        except ImportError:
+            return ""
+
+    try:
+        with open(path, "rb") as f:
+            pyproject = toml_parser.load(f)
+    except (OSError, ValueError):
+        return ""
+    project = pyproject.get("project")
+    name = project.get("name", "") if isinstance(project, dict) else ""
+    return name if isinstance(name, str) else ""
+
+
+def _parse_source(path: str, mtime_ns: int, size: int) -> ast.Module | None:
+    """Parse a Python source file.
+
+    The tree isn't cached: the index builders that call this are memoized per
+    file version and keep only what they derive from it.
+
+    Args:
+        path: Path to the source file.
+        mtime_ns: File modification time in nanoseconds.
+        size: File size in bytes.
+
+    Returns:
+        The parsed module, or None on syntax errors.
+
+    Raises:
+        OSError: If the file can't be read.
+        UnicodeDecodeError: If the file isn't valid UTF-8.
+    """
+    content = _read_text_cached(path, mtime_ns, size)
+    try:
+        return ast.parse(content, filename=path)
+    except (SyntaxError, ValueError):
+        return None
+
+
+def _node_range(node: ast.AST) -> tuple[int, int, int] | None:
+    """Compute the 0-based line and column span of the name a node references.
+
+    Args:
+        node: A Name, Attribute or alias node.
+
+    Returns:
+        (line, start column, end column), or None if the node has no position.
+    """
+    if not hasattr(node, "lineno") or not hasattr(node, "col_offset"):
+        return None
+
+    line_num = node.lineno - 1  # Convert to 0-based
+    column = node.col_offset
+
+    # Calculate end position
+    if isinstance(node, ast.Name):
+        end_column = column + len(node.id)
+    elif isinstance(node, ast.Attribute):
+        # col_offset is where the accessed value starts; the attribute name
+        # itself ends the node
+        if node.end_lineno is not None and node.end_col_offset is not None:
+            line_num = node.end_lineno - 1
+            end_column = node.end_col_offset
+            column = end_column - len(node.attr)
+        else:
+            end_column = column + len(node.attr)
+    elif isinstance(node, ast.alias):
+        name = node.asname if node.asname else node.name
+        end_column = column + len(name)
+    else:
+        end_column = column
+
+    return line_num, column, end_column
+
+
+@lru_cache(maxsize=512)
+def _reference_index_cached(
+    path: str, mtime_ns: int, size: int
+) -> dict[str, tuple[tuple[int, int, int], ...]]:
+    """Index the references to every name in a source file (memoized per file version).
+
+    Built with a single AST walk, so queries for different names on the same file
+    are dictionary lookups. Only plain (line, start column, end column) tuples
+    are kept, not the tree nodes.
+
+    Args:
+        path: Path to the source file.
+        mtime_ns: File modification time in nanoseconds.
+        size: File size in bytes.
+
+    Returns:
+        Mapping of each referenced name to its ranges, in AST traversal order.
+
+    Raises:
+        OSError: If the file can't be read.
+        UnicodeDecodeError: If the file isn't valid UTF-8.
+    """
+    tree = _parse_source(path, mtime_ns, size)
+    if tree is None:
+        return {}
+
+    indexer = _ReferenceIndexer()
+    indexer.visit(tree)
+    index: dict[str, tuple[tuple[int, int, int], ...]] = {}
+    for name, nodes in indexer.index.items():
+        ranges = [node_range for node in nodes if (node_range := _node_range(node)) is not None]
+        if ranges:
+            index[name] = tuple(ranges)
+    return index
+
+
+@lru_cache(maxsize=512)
+def _definition_types_cached(path: str, mtime_ns: int, size: int) -> dict[str, str]:
+    """Find how each name in a source file is defined (memoized per file version).
+
+    Uses the same definition index as go-to-definition, so queries for
+    different names on the same file are dictionary lookups.
+
+    Args:
+        path: Path to the source file.
+        mtime_ns: File modification time in nanoseconds.
+        size: File size in bytes.
+
+    Returns:
+        Mapping of each defined name to its artifact type.
+
+    Raises:
+        OSError: If the file can't be read.
+        UnicodeDecodeError: If the file isn't valid UTF-8.
+    """
+    tree = _parse_source(path, mtime_ns, size)
+    if tree is None:
+        return {}
+    return _definition_types(tree)
+
+
+def _list_directory(directory: str) -> dict[str, bool]:
+    """List a directory's entries along with whether each is a file.
+
+    Args:
+        directory: Directory to list.
+
+    Returns:
+        Mapping of entry name to True for files (following symlinks), or an
+        empty mapping if the directory can't be read.
+    """
+    listing: dict[str, bool] = {}
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    listing[entry.name] = entry.is_file()
+                except OSError:
+                    listing[entry.name] = False
+    except OSError:
+        pass
+    return listing
+
+
+def _find_artifact(manifest: dict[str, Any], artifact_name: str) -> dict | None:
+    """Find an artifact by name in a parsed manifest's expectedArtifacts.
+
+    Args:
+        manifest: The parsed manifest.
+        artifact_name: Name of the artifact.
+
+    Returns:
+        The artifact dictionary, or None if the manifest doesn't declare it.
+    """
+    expected_artifacts = manifest.get("expectedArtifacts", {})
+    if not isinstance(expected_artifacts, dict):
+        return None
+    contains = expected_artifacts.get("contains", [])
+    if not isinstance(contains, list):
+        return None
+
+    for artifact in contains:
+        if isinstance(artifact, dict) and artifact.get("name") == artifact_name:
+            return artifact
+
+    return None
+
+
+def _file_contains(path: Path, needle: bytes) -> bool:
+    """Check whether a file's bytes contain a substring.
+
+    Larger files are searched through a read-only memory map, so the kernel's
+    page cache is scanned in place instead of being copied into a bytes object.
+
+    Args:
+        path: Path to the file.
+        needle: The bytes to look for.
+
+    Returns:
+        True if the file contains the bytes, False otherwise or if it can't be read.
+    """
+    try:
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < _MMAP_MIN_SIZE:
+                return needle in f.read()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return mapped.find(needle) != -1
+    except (OSError, ValueError):
+        return False
+
+
+class _WorkspaceFiles(NamedTuple):
+    """Manifest and source files found by a walk of the workspace."""
+
+    manifests: list[Path]
+    sources: list[Path]
+
+
+class _DirectoryListing(NamedTuple):
+    """Entries of one directory as seen by the workspace index."""
+
+    mtime_ns: int
+    subdirs: tuple[str, ...]
+    manifests: tuple[str, ...]
+    sources: tuple[str, ...]
+
+
+def _scan_directory(path: str, mtime_ns: int, skip_dirs: frozenset[str]) -> _DirectoryListing:
+    """List the subdirectories, manifests and Python files of one directory.
+
+    Uses os.scandir so that file type checks come from the directory entry
+    rather than a stat call per path. Symlinks are not followed and
+    directories named in skip_dirs are left out.
+
+    Args:
+        path: Directory to list.
+        mtime_ns: Modification time the listing is valid for.
+        skip_dirs: Directory names to skip entirely.
+
+    Returns:
+        The directory's listing, empty if it can't be read.
+    """
+    subdirs: list[str] = []
+    manifests: list[str] = []
+    sources: list[str] = []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in skip_dirs:
+                            subdirs.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        if entry.name.endswith(".manifest.json"):
+                            manifests.append(entry.path)
+                        elif entry.name.endswith(".py"):
+                            sources.append(entry.path)
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return _DirectoryListing(mtime_ns, tuple(subdirs), tuple(manifests), tuple(sources))
+
+
+class _WorkspaceIndex:
+    """Manifests and Python files below a workspace root, kept across requests.
+
+    Each refresh stats the indexed directories and lists again only those
+    whose modification time changed, since creating, deleting or renaming a
+    file updates its parent directory.
+    """
+
+    def __init__(self, root: Path, skip_dirs: frozenset[str] = frozenset()) -> None:
+        """Initialize an empty index.
+
+        Args:
+            root: Directory to index.
+            skip_dirs: Directory names to skip entirely.
+        """
+        self.root = root
+        self.skip_dirs = skip_dirs
+        self._directories: dict[str, _DirectoryListing] = {}
+
+    def refresh(self) -> bool:
+        """Bring the index up to date with the file system.
+
+        Returns:
+            True if any directory was added, removed or listed again.
+        """
+        previous = self._directories
+        directories: dict[str, _DirectoryListing] = {}
+        changed = False
+        # Depth first, visiting subdirectories in listing order
+        pending = [str(self.root)]
+        now = time.time_ns()
+        while pending:
+            path = pending.pop()
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+            except OSError:
+                continue
+            listing = previous.get(path)
+            if listing is None or listing.mtime_ns != mtime_ns:
+                # Recently modified directories are listed again next time
+                valid_for = mtime_ns if now - mtime_ns > _DIRECTORY_SETTLE_NS else -1
+                listing = _scan_directory(path, valid_for, self.skip_dirs)
+                changed = True
+            directories[path] = listing
+            pending.extend(reversed(listing.subdirs))
+
+        self._directories = directories
+        return changed or len(directories) != len(previous)
+
+    def manifests(self) -> Iterator[str]:
+        """Yield the paths of all indexed manifests."""
+        for listing in self._directories.values():
+            yield from listing.manifests
+
+    def sources(self) -> Iterator[str]:
+        """Yield the paths of all indexed Python files."""
+        for listing in self._directories.values():
+            yield from listing.sources
+
 
 class ReferencesHandler:
     """Handles find-references requests.
@@ -38,6 +619,21 @@ class ReferencesHandler:
                 If None, creates a new instance.
         """
         self.runner = runner if runner is not None else MaidRunner()
+        # Directory index of the workspace, and the files selected from it by
+        # the last request along with the source prefixes used to select them
+        self._workspace_index: _WorkspaceIndex | None = None
+        self._workspace_listing: tuple[tuple[str, ...], _WorkspaceFiles] | None = None
+        # Coalesces the requests a client fires while the cursor moves
+        self._debouncer = Debouncer(_REQUEST_DEBOUNCE_MS)
+
+    def clear_workspace_cache(self) -> None:
+        """Forget the files selected from the workspace index by the last request.
+
+        Called when the client reports manifest changes. The directory index
+        itself is kept, since each refresh already lists again the directories
+        whose modification time changed.
+        """
+        self._workspace_listing = None
 
     async def get_references(
         self, params: ReferenceParams, document: TextDocument
@@ -58,7 +654,8 @@ class ReferencesHandler:
             document: The text document to search for artifacts.
 
         Returns:
-            A list of Locations where the artifact is referenced, or None if error.
+            A list of Locations where the artifact is referenced, or None if a
+            newer request for the same document superseded this one.
         """
         if not document.source:
             return []
@@ -71,33 +668,31 @@ class ReferencesHandler:
         if not word:
             return []
 
+        # A newer request for the same document supersedes this one while it waits
+        if await wait_superseded(self._debouncer, uri):
+            return None
+
         references: list[Location] = []
 
         # Determine if we're in a manifest or source file
         if self._is_manifest_file(file_path):
-            # Find artifact info from manifest
-            artifact_info = self._get_artifact_info_from_manifest(document, word)
+            # Find artifact info from manifest, parsing the document off the event loop
+            artifact_info = await asyncio.to_thread(
+                self._get_artifact_info_from_manifest, document, word
+            )
             if artifact_info:
-                # Find references in manifests
-                references.extend(await self._find_in_manifests(word, artifact_info))
-                # Find references in test files (using validationCommand from current manifest)
                 references.extend(
-                    await self._find_in_tests(word, artifact_info, document, file_path)
+                    await self._find_all_references(word, artifact_info, document, file_path)
                 )
-                # Find references in source files
-                references.extend(await self._find_in_source(word, artifact_info))
         else:
             # Find artifact info from source file
-            artifact_info = self._get_artifact_info_from_source(file_path, word)
+            artifact_info = await asyncio.to_thread(
+                self._get_artifact_info_from_source, file_path, word
+            )
             if artifact_info:
-                # Find references in manifests
-                references.extend(await self._find_in_manifests(word, artifact_info))
-                # Find references in test files (find manifests that define artifact)
                 references.extend(
-                    await self._find_in_tests(word, artifact_info, document, file_path)
+                    await self._find_all_references(word, artifact_info, document, file_path)
                 )
-                # Find references in source files
-                references.extend(await self._find_in_source(word, artifact_info))
             else:
                 # If we can't determine artifact type from source, try to find it in manifests
                 # This handles cases where the artifact is defined in source but we need manifest info
@@ -112,31 +707,21 @@ class ReferencesHandler:
                     else:
                         manifests = await self.runner.find_manifests(file_path)
 
-                    # Search manifests for this artifact
+                    # Search manifests for this artifact (parsed through the
+                    # per-version manifest cache shared with the reference search)
                     for manifest_path in manifests:
-                        if not manifest_path.exists():
+                        manifest = self._load_manifest(manifest_path)
+                        if manifest is None:
                             continue
-                        try:
-                            with open(manifest_path, encoding="utf-8") as f:
-                                manifest_content = f.read()
-                            artifact_info = self._get_artifact_info_from_manifest(
-                                TextDocument(f"file://{manifest_path}", manifest_content),
-                                word,
-                            )
-                            if artifact_info:
-                                # Found artifact in manifest, now find all references
-                                references.extend(
-                                    await self._find_in_manifests(word, artifact_info)
+                        artifact_info = _find_artifact(manifest, word)
+                        if artifact_info:
+                            # Found artifact in manifest, now find all references
+                            references.extend(
+                                await self._find_all_references(
+                                    word, artifact_info, document, file_path
                                 )
-                                references.extend(
-                                    await self._find_in_tests(
-                                        word, artifact_info, document, file_path
-                                    )
-                                )
-                                references.extend(await self._find_in_source(word, artifact_info))
-                                break
-                        except (OSError, json.JSONDecodeError):
-                            continue
+                            )
+                            break
                 except Exception:
                     pass
 
@@ -165,58 +750,137 @@ class ReferencesHandler:
 
         return deduplicated
 
-    async def _find_in_manifests(
+    async def _find_all_references(
         self,
         artifact_name: str,
-        artifact_info: dict,  # noqa: ARG002
+        artifact_info: dict,
+        document: TextDocument,
+        file_path: Path,
     ) -> list[Location]:
-        """Find references to artifact in manifest files.
+        """Find references to artifact in manifests, test files and source files.
 
-        Optimized with quick text search before JSON parsing.
+        The workspace is walked once and the candidate files are shared by the
+        manifest, test and source searches, which run concurrently.
 
         Args:
             artifact_name: Name of the artifact.
             artifact_info: Dictionary with artifact type and other info.
+            document: The current document (manifest or source file).
+            file_path: Path to the current document.
 
         Returns:
-            List of Locations where artifact is referenced in manifests.
+            List of Locations where artifact is referenced.
         """
-        references: list[Location] = []
+        workspace_files = await asyncio.to_thread(self._scan_workspace, artifact_name)
+
+        # The manifest, test and source searches share the walk and are
+        # independent, so they run concurrently; results stay in that order
+        results = await asyncio.gather(
+            self._find_in_manifests(artifact_name, artifact_info, workspace_files),
+            # Test files come from the validationCommand of manifests
+            self._find_in_tests(artifact_name, artifact_info, document, file_path, workspace_files),
+            self._find_in_source(artifact_name, artifact_info, workspace_files),
+        )
+        return [location for locations in results for location in locations]
 
-        # Search workspace for manifest files
-        workspace_root = Path.cwd()
-        manifest_dirs = [
-            workspace_root / "manifests",
-            workspace_root,
-        ]
+    def _scan_workspace(self, artifact_name: str) -> _WorkspaceFiles:
+        """Collect the manifests and source files to search for an artifact.
+
+        Uses a quick text search over the cached workspace listing so that only
+        files mentioning the artifact name are returned.
+
+        Args:
+            artifact_name: Name of the artifact.
 
-        # Quick text search first - only parse manifests that contain the artifact name
+        Returns:
+            The candidate manifest and source files.
+        """
+        listing = self._get_workspace_listing(Path.cwd())
         artifact_bytes = artifact_name.encode("utf-8")
-        manifests_to_parse: list[Path] = []
 
-        for manifest_dir in manifest_dirs:
-            if not manifest_dir.exists():
+        # Quick check: does file contain artifact name? (much faster than parsing)
+        return _WorkspaceFiles(
+            [path for path in listing.manifests if _file_contains(path, artifact_bytes)],
+            [path for path in listing.sources if _file_contains(path, artifact_bytes)],
+        )
+
+    def _get_workspace_listing(self, workspace_root: Path) -> _WorkspaceFiles:
+        """Return the workspace's manifests and searchable source files.
+
+        The workspace is indexed once; later requests only list directories
+        that changed since, and reuse the previous selection when none did.
+
+        Args:
+            workspace_root: Root of the workspace.
+
+        Returns:
+            All manifests and searchable source files in the workspace.
+        """
+        index = self._workspace_index
+        if index is None or index.root != workspace_root:
+            index = _WorkspaceIndex(workspace_root, _SKIPPED_WORKSPACE_DIRS)
+            self._workspace_index = index
+            self._workspace_listing = None
+        changed = index.refresh()
+
+        # Source files are only searched below the package directories (relative
+        # path prefixes) and outside of test and build directories
+        source_prefixes = tuple(
+            "" if source_dir == workspace_root else f"{source_dir.name}{os.sep}"
+            for source_dir in self._get_source_dirs(workspace_root)
+        )
+        cached = self._workspace_listing
+        if cached is not None and not changed and cached[0] == source_prefixes:
+            return cached[1]
+
+        root_prefix_len = len(str(workspace_root).rstrip(os.sep)) + 1
+        sources: list[Path] = []
+        for path in index.sources():
+            relative = path[root_prefix_len:]
+            if not relative.startswith(source_prefixes):
+                continue
+            if any(part in _EXCLUDED_SOURCE_DIRS for part in relative.split(os.sep)[:-1]):
                 continue
+            sources.append(Path(path))
 
-            for manifest_path in manifest_dir.rglob("*.manifest.json"):
-                if not manifest_path.is_file():
-                    continue
+        listing = _WorkspaceFiles([Path(path) for path in index.manifests()], sources)
+        self._workspace_listing = (source_prefixes, listing)
+        return listing
 
-                # Quick check: does file contain artifact name?
-                try:
-                    with open(manifest_path, "rb") as f:
-                        content = f.read()
-                        if artifact_bytes in content:
-                            manifests_to_parse.append(manifest_path)
-                except OSError:
-                    continue
+    async def _find_in_manifests(
+        self,
+        artifact_name: str,
+        artifact_info: dict,  # noqa: ARG002
+        workspace_files: _WorkspaceFiles | None = None,
+    ) -> list[Location]:
+        """Find references to artifact in manifest files.
+
+        Optimized with quick text search before JSON parsing.
+
+        Args:
+            artifact_name: Name of the artifact.
+            artifact_info: Dictionary with artifact type and other info.
+            workspace_files: Candidate files from a previous workspace walk.
+                If None, the workspace is walked.
+
+        Returns:
+            List of Locations where artifact is referenced in manifests.
+        """
+        references: list[Location] = []
+
+        if workspace_files is None:
+            workspace_files = await asyncio.to_thread(self._scan_workspace, artifact_name)
 
         # Now parse only the manifests that contain the artifact
-        for manifest_path in manifests_to_parse:
-            # Find artifact references in this manifest
-            # Note: _find_artifact_references_in_manifest handles OSError internally
-            manifest_refs = self._find_artifact_references_in_manifest(manifest_path, artifact_name)
-            references.extend(manifest_refs)
+        # Note: _find_artifact_references_in_manifest handles OSError internally
+        references.extend(
+            await self._scan_files_parallel(
+                workspace_files.manifests,
+                lambda manifest_path: self._find_artifact_references_in_manifest(
+                    manifest_path, artifact_name
+                ),
+            )
+        )
 
         return references
 
@@ -226,6 +890,7 @@ class ReferencesHandler:
         artifact_info: dict,
         document: TextDocument,
         file_path: Path,
+        workspace_files: _WorkspaceFiles | None = None,
     ) -> list[Location]:
         """Find references to artifact in test files using validationCommand from manifests.
 
@@ -234,6 +899,8 @@ class ReferencesHandler:
             artifact_info: Dictionary with artifact type and other info.
             document: The current document (manifest or source file).
             file_path: Path to the current document.
+            workspace_files: Candidate files from a previous workspace walk.
+                If None, the workspace is walked when manifests are needed.
 
         Returns:
             List of Locations where artifact is referenced in test files.
@@ -241,102 +908,116 @@ class ReferencesHandler:
         references: list[Location] = []
         workspace_root = Path.cwd()
 
-        # Get test files from validationCommand in manifests
+        # Reading manifests and probing test paths touches the disk, so it runs
+        # in a worker thread rather than on the event loop
+        test_files = await asyncio.to_thread(
+            self._collect_test_files,
+            artifact_name,
+            document,
+            file_path,
+            workspace_root,
+            workspace_files,
+        )
+
+        # Search for artifact references in the specific test files
+        # (_find_artifact_references_in_source does a quick text search first)
+        references.extend(
+            await self._scan_files_parallel(
+                sorted(test_files),
+                lambda test_path: self._find_artifact_references_in_source(
+                    test_path, artifact_name, artifact_info, workspace_root
+                ),
+            )
+        )
+
+        return references
+
+    def _collect_test_files(
+        self,
+        artifact_name: str,
+        document: TextDocument,
+        file_path: Path,
+        workspace_root: Path,
+        workspace_files: _WorkspaceFiles | None,
+    ) -> set[Path]:
+        """Collect the test files named by the validationCommand of relevant manifests.
+
+        Args:
+            artifact_name: Name of the artifact.
+            document: The current document (manifest or source file).
+            file_path: Path to the current document.
+            workspace_root: Root of the workspace.
+            workspace_files: Candidate files from a previous workspace walk.
+                If None, the workspace is walked when manifests are needed.
+
+        Returns:
+            The test files to search.
+        """
+        # Get test files from validationCommand in manifests, listing each
+        # directory they name only once
         test_files: set[Path] = set()
+        dir_listings: dict[str, dict[str, bool]] = {}
 
         if self._is_manifest_file(file_path):
             # We're in a manifest - use its validationCommand
             try:
-                manifest = json.loads(document.source)
+                manifest = fast_json.loads(document.source)
                 validation_command = manifest.get("validationCommand", [])
                 test_files.update(
-                    self._extract_test_files_from_command(validation_command, workspace_root)
+                    self._extract_test_files_from_command(
+                        validation_command, workspace_root, dir_listings
+                    )
                 )
-            except json.JSONDecodeError:
+            except fast_json.JSONDecodeError:
                 pass
         else:
             # We're in a source file - find all manifests that define this artifact
-            # Use quick text search first
-            artifact_bytes = artifact_name.encode("utf-8")
-            manifest_dirs = [
-                workspace_root / "manifests",
-                workspace_root,
-            ]
-
-            manifests_to_check: list[Path] = []
-            for manifest_dir in manifest_dirs:
-                if not manifest_dir.exists():
-                    continue
-
-                for manifest_path in manifest_dir.rglob("*.manifest.json"):
-                    if not manifest_path.is_file():
-                        continue
-
-                    # Quick check: does file contain artifact name?
-                    try:
-                        with open(manifest_path, "rb") as f:
-                            if artifact_bytes in f.read():
-                                manifests_to_check.append(manifest_path)
-                    except OSError:
-                        continue
+            # (the workspace walk already did a quick text search)
+            if workspace_files is None:
+                workspace_files = self._scan_workspace(artifact_name)
 
             # Now parse only manifests that might contain the artifact
-            for manifest_path in manifests_to_check:
+            for manifest_path in workspace_files.manifests:
+                version = _file_version(manifest_path)
+                if version is None:
+                    continue
                 try:
-                    with open(manifest_path, encoding="utf-8") as f:
-                        manifest = json.loads(f.read())
-                except (OSError, json.JSONDecodeError):
+                    # Check if this manifest defines the artifact (a set lookup
+                    # once the manifest version has been seen)
+                    if artifact_name not in _artifact_names_cached(*version):
+                        continue
+                    manifest = _load_manifest_cached(*version)
+                except (OSError, UnicodeDecodeError):
                     continue
-
-                # Check if this manifest defines the artifact
-                expected_artifacts = manifest.get("expectedArtifacts", {})
-                contains = expected_artifacts.get("contains", [])
-                if not isinstance(contains, list):
+                if manifest is None:
                     continue
 
-                artifact_found = False
-                for artifact in contains:
-                    if isinstance(artifact, dict) and artifact.get("name") == artifact_name:
-                        artifact_found = True
-                        break
-
-                if artifact_found:
-                    # Extract test files from this manifest's validationCommand
-                    validation_command = manifest.get("validationCommand", [])
-                    test_files.update(
-                        self._extract_test_files_from_command(validation_command, workspace_root)
+                # Extract test files from this manifest's validationCommand
+                validation_command = manifest.get("validationCommand", [])
+                test_files.update(
+                    self._extract_test_files_from_command(
+                        validation_command, workspace_root, dir_listings
                     )
+                )
 
-        # Search for artifact references in the specific test files
-        # Quick text search first
-        artifact_bytes = artifact_name.encode("utf-8")
-        for test_path in test_files:
-            if not test_path.exists() or not test_path.is_file():
-                continue
-
-            # Quick check: does file contain artifact name?
-            try:
-                with open(test_path, "rb") as f:
-                    if artifact_bytes not in f.read():
-                        continue
-            except OSError:
-                continue
-
-            test_refs = self._find_artifact_references_in_source(
-                test_path, artifact_name, artifact_info, workspace_root
-            )
-            references.extend(test_refs)
-
-        return references
+        return test_files
 
     def _extract_test_files_from_command(
-        self, validation_command: list, workspace_root: Path
+        self,
+        validation_command: list,
+        workspace_root: Path,
+        dir_listings: dict[str, dict[str, bool]] | None = None,
     ) -> list[Path]:
         """Extract test file paths from validationCommand array.
 
+        Each directory named by the command is listed once with os.scandir, and
+        every token in it is answered from that listing, including misses.
+
         Args:
             validation_command: The validationCommand array (e.g., ["pytest", "tests/test_*.py", "-v"]).
             workspace_root: Root of the workspace.
+            dir_listings: Directory listings (entry name -> is a file) to reuse
+                across calls. If None, listings are kept for this call only.
 
         Returns:
             List of Path objects for test files.
@@ -346,6 +1027,8 @@ class ReferencesHandler:
         if not isinstance(validation_command, list):
             return test_files
 
+        listings = dir_listings if dir_listings is not None else {}
+
         for item in validation_command:
             if not isinstance(item, str):
                 continue
@@ -360,25 +1043,31 @@ class ReferencesHandler:
 
             # Check if it looks like a test file path
             if "test" in item.lower() or item.endswith(".py"):
-                # Resolve relative to workspace root
-                test_path = (workspace_root / item).resolve()
-                if test_path.exists() and test_path.is_file():
-                    test_files.append(test_path)
-                else:
-                    # Try glob pattern matching
-                    if "*" in item:
-                        pattern_path = workspace_root / item
-                        # Find parent directory
-                        parent = pattern_path.parent
-                        pattern = pattern_path.name
-                        if parent.exists():
-                            for matched_file in parent.glob(pattern):
-                                if matched_file.is_file():
-                                    test_files.append(matched_file.resolve())
+                # Resolve relative to workspace root; abspath normalizes without
+                # the lstat calls that resolve() makes
+                directory, name = os.path.split(os.path.abspath(workspace_root / item))
+                listing = listings.get(directory)
+                if listing is None:
+                    listing = listings[directory] = _list_directory(directory)
+
+                if listing.get(name):
+                    test_files.append(Path(directory, name))
+                elif "*" in name:
+                    # Try glob pattern matching against the directory's entries
+                    test_files.extend(
+                        Path(directory, entry_name)
+                        for entry_name, is_file in listing.items()
+                        if is_file and fnmatch.fnmatchcase(entry_name, name)
+                    )
 
         return test_files
 
-    async def _find_in_source(self, artifact_name: str, artifact_info: dict) -> list[Location]:
+    async def _find_in_source(
+        self,
+        artifact_name: str,
+        artifact_info: dict,
+        workspace_files: _WorkspaceFiles | None = None,
+    ) -> list[Location]:
         """Find references to artifact in source files.
 
         Optimized to only search relevant directories and use fast text search
@@ -387,6 +1076,8 @@ class ReferencesHandler:
         Args:
             artifact_name: Name of the artifact.
             artifact_info: Dictionary with artifact type and other info.
+            workspace_files: Candidate files from a previous workspace walk.
+                If None, the workspace is walked.
 
         Returns:
             List of Locations where artifact is referenced in source files.
@@ -394,40 +1085,73 @@ class ReferencesHandler:
         references: list[Location] = []
         workspace_root = Path.cwd()
 
+        if workspace_files is None:
+            workspace_files = await asyncio.to_thread(self._scan_workspace, artifact_name)
+
+        # Now parse only the files that contain the artifact
+        references.extend(
+            await self._scan_files_parallel(
+                workspace_files.sources,
+                lambda source_path: self._find_artifact_references_in_source(
+                    source_path, artifact_name, artifact_info, workspace_root
+                ),
+            )
+        )
+
+        return references
+
+    async def _scan_files_parallel(
+        self, paths: list[Path], scan: Callable[[Path], list[Location]]
+    ) -> list[Location]:
+        """Scan files in worker threads, bounded by the number of CPUs.
+
+        JSON decoding, regex matching and AST parsing release the GIL for much of
+        their work, so independent files are scanned concurrently. Results keep
+        the order of paths.
+
+        Args:
+            paths: Files to scan.
+            scan: Function returning the references found in one file.
+
+        Returns:
+            The references from all files.
+        """
+        if not paths:
+            return []
+        if len(paths) == 1:
+            return await asyncio.to_thread(scan, paths[0])
+
+        semaphore = asyncio.Semaphore(_MAX_PARALLEL_SCANS)
+
+        async def scan_one(path: Path) -> list[Location]:
+            async with semaphore:
+                return await asyncio.to_thread(scan, path)
+
+        results = await asyncio.gather(*(scan_one(path) for path in paths))
+        return [location for locations in results for location in locations]
+
+    def _get_source_dirs(self, workspace_root: Path) -> list[Path]:
+        """Determine the directories that contain project source files.
+
+        Args:
+            workspace_root: Root of the workspace.
+
+        Returns:
+            Package directories to search, or the workspace root if none found.
+        """
         # Smart search scope: prioritize package directories but also search workspace
         # This balances performance with completeness
         source_dirs: list[Path] = []
 
         # First, try to find package directory from pyproject.toml
-        # This is optional - if tomli isn't available, we'll use common locations
-        if (workspace_root / "pyproject.toml").exists():
-            try:
-                # Try tomli first, then tomllib (Python 3.11+)
-                toml_parser = None
-                try:
-                    import tomli
-
-                    toml_parser = tomli
-                except ImportError:
-                    try:
-                        import tomllib
-
-                        toml_parser = tomllib
-                    except ImportError:
-                        pass
-
-                if toml_parser:
-                    with open(workspace_root / "pyproject.toml", "rb") as f:
-                        pyproject = toml_parser.load(f)
-                        package_name = pyproject.get("project", {}).get("name", "")
-                        if package_name:
-                            # Convert package name to directory (e.g., "maid-lsp" -> "maid_lsp")
-                            package_dir = package_name.replace("-", "_")
-                            package_path = workspace_root / package_dir
-                            if package_path.exists() and package_path.is_dir():
-                                source_dirs.append(package_path)
-            except (OSError, KeyError, AttributeError):
-                pass
+        # (parsed once per pyproject.toml version)
+        version = _file_version(workspace_root / "pyproject.toml")
+        package_name = _pyproject_package_name_cached(*version) if version else ""
+        if package_name:
+            # Convert package name to directory (e.g., "maid-lsp" -> "maid_lsp")
+            package_path = workspace_root / package_name.replace("-", "_")
+            if package_path.is_dir():
+                source_dirs.append(package_path)
 
         # Add common package locations
         common_dirs = ["maid_lsp", "src", "lib"]
@@ -440,57 +1164,7 @@ class ReferencesHandler:
         if not source_dirs:
             source_dirs = [workspace_root]
 
-        # Quick text search first - only parse files that contain the artifact name
-        artifact_bytes = artifact_name.encode("utf-8")
-        files_to_parse: list[Path] = []
-
-        for source_dir in source_dirs:
-            if not source_dir.exists():
-                continue
-
-            # Look for Python source files (exclude tests and common non-source dirs)
-            exclude_dirs = {
-                "test",
-                "tests",
-                "__pycache__",
-                ".pytest_cache",
-                "build",
-                "dist",
-                ".venv",
-                "venv",
-                "node_modules",
-                ".git",
-            }
-            for source_path in source_dir.rglob("*.py"):
-                if not source_path.is_file():
-                    continue
-                # Skip if any part of the path is in exclude list
-                if any(part in exclude_dirs for part in source_path.parts):
-                    continue
-
-                # Quick check: does file contain artifact name? (much faster than AST parsing)
-                try:
-                    with open(source_path, "rb") as f:
-                        # Read first 64KB for quick check
-                        chunk = f.read(65536)
-                        if artifact_bytes in chunk:
-                            files_to_parse.append(source_path)
-                            # If file is small, we already have it in memory
-                            if len(chunk) < 65536:
-                                # Re-read full file for parsing
-                                f.seek(0)
-                                continue
-                except OSError:
-                    continue
-
-        # Now parse only the files that contain the artifact
-        for source_path in files_to_parse:
-            source_refs = self._find_artifact_references_in_source(
-                source_path, artifact_name, artifact_info, workspace_root
-            )
-            references.extend(source_refs)
-
-        return references
+        return source_dirs
 
     def _find_artifact_references_in_manifest(
         self,
@@ -508,29 +1182,28 @@ class ReferencesHandler:
         """
         references: list[Location] = []
 
-        # Read manifest file to find line numbers
+        # The string tokens of each manifest are indexed once per file version
+        version = _file_version(manifest_path)
+        if version is None:
+            return references
         try:
-            with open(manifest_path, encoding="utf-8") as f:
-                lines = f.readlines()
-        except OSError:
+            ranges = _manifest_string_index_cached(*version).get(artifact_name)
+        except (OSError, UnicodeDecodeError):
+            return references
+        if not ranges:
             return references
 
-        # Search for artifact name in manifest content
-        pattern = rf'["\']{re.escape(artifact_name)}["\']'
-        for line_num, line in enumerate(lines):
-            for match in re.finditer(pattern, line):
-                column = match.start()
-                end_column = match.end()
-
-                references.append(
-                    Location(
-                        uri=self._path_to_uri(manifest_path),
-                        range=Range(
-                            start=Position(line=line_num, character=column),
-                            end=Position(line=line_num, character=end_column),
-                        ),
-                    )
+        uri = self._path_to_uri(manifest_path)
+        for line_num, column, end_column in ranges:
+            references.append(
+                Location(
+                    uri=uri,
+                    range=Range(
+                        start=Position(line=line_num, character=column),
+                        end=Position(line=line_num, character=end_column),
+                    ),
                 )
+            )
 
         return references
 
@@ -552,109 +1225,71 @@ class ReferencesHandler:
         Returns:
             List of Locations where artifact is referenced.
         """
-        references: list[Location] = []
+        references = self._find_names_in_source(source_path, frozenset((artifact_name,)))
+        return references.get(artifact_name, [])
 
-        tree = parse_file(source_path)
-        if tree is None:
-            return references
+    def _find_names_in_source(
+        self, source_path: Path, names: frozenset[str]
+    ) -> dict[str, list[Location]]:
+        """Find references to several names in a Python source file in one pass.
 
-        # Read file to get exact positions
+        Args:
+            source_path: Path to the source file.
+            names: The names to find.
+
+        Returns:
+            Mapping of each name found to the Locations where it is referenced.
+        """
+        references: dict[str, list[Location]] = {}
+
+        # File contents and the references found are cached per file version
+        version = _file_version(source_path)
+        if version is None:
+            return references
         try:
-            with open(source_path, encoding="utf-8") as f:
-                lines = f.readlines()
-        except OSError:
+            content = _read_text_cached(*version)
+            # Quick check before parsing: one of the names must occur in the file
+            if not any(name in content for name in names):
+                return references
+            index = _reference_index_cached(*version)
+        except (OSError, UnicodeDecodeError):
             return references
 
-        # Find all references using AST
-        for node in ast.walk(tree):
-            # Function/method calls
-            if isinstance(node, ast.Call):
-                if isinstance(node.func, ast.Name) and node.func.id == artifact_name:
-                    ref = self._create_location_from_node(node.func, lines, source_path)
-                    if ref:
-                        references.append(ref)
-                elif isinstance(node.func, ast.Attribute):
-                    if node.func.attr == artifact_name:
-                        ref = self._create_location_from_node(node.func, lines, source_path)
-                        if ref:
-                            references.append(ref)
-
-            # Attribute access
-            if isinstance(node, ast.Attribute) and node.attr == artifact_name:
-                ref = self._create_location_from_node(node, lines, source_path)
-                if ref:
-                    references.append(ref)
-
-            # Name references (imports, assignments, etc.)
-            if (
-                isinstance(node, ast.Name)
-                and node.id == artifact_name
-                and not isinstance(node.ctx, ast.Store)
-            ):
-                ref = self._create_location_from_node(node, lines, source_path)
-                if ref:
-                    references.append(ref)
-
-            # Import statements
-            if isinstance(node, ast.Import):
-                for alias in node.names:
-                    if alias.asname == artifact_name or (
-                        alias.name == artifact_name and alias.asname is None
-                    ):
-                        ref = self._create_location_from_node(alias, lines, source_path)
-                        if ref:
-                            references.append(ref)
-
-            if isinstance(node, ast.ImportFrom):
-                for alias in node.names:
-                    if alias.name == artifact_name:
-                        ref = self._create_location_from_node(alias, lines, source_path)
-                        if ref:
-                            references.append(ref)
+        uri = self._path_to_uri(source_path)
+        for name in names:
+            ranges = index.get(name)
+            if not ranges:
+                continue
+            references[name] = [
+                Location(
+                    uri=uri,
+                    range=Range(
+                        start=Position(line=line_num, character=column),
+                        end=Position(line=line_num, character=end_column),
+                    ),
+                )
+                for line_num, column, end_column in ranges
+            ]
 
         return references
 
-    def _create_location_from_node(
-        self, node: ast.AST, lines: list[str], file_path: Path
-    ) -> Location | None:
-        """Create a Location from an AST node.
+    def _load_manifest(self, manifest_path: Path) -> dict[str, Any] | None:
+        """Load a manifest file through the per-version cache.
 
         Args:
-            node: The AST node.
-            lines: List of file lines for position calculation.
-            file_path: Path to the source file.
+            manifest_path: Path to the manifest file.
 
         Returns:
-            Location object, or None if creation fails.
+            The parsed manifest, or None if it can't be read or isn't valid.
         """
-        if not hasattr(node, "lineno") or not hasattr(node, "col_offset"):
+        version = _file_version(manifest_path)
+        if version is None:
             return None
-
-        line_num = node.lineno - 1  # Convert to 0-based
-        column = node.col_offset
-
-        if line_num >= len(lines):
+        try:
+            return _load_manifest_cached(*version)
+        except (OSError, UnicodeDecodeError):
             return None
 
-        # Calculate end position
-        if isinstance(node, ast.Name):
-            end_column = column + len(node.id)
-        elif isinstance(node, ast.Attribute):
-            end_column = column + len(node.attr)
-        elif isinstance(node, ast.alias):
-            name = node.asname if node.asname else node.name
-            end_column = column + len(name)
-        else:
-            end_column = column
-
-        return Location(
-            uri=self._path_to_uri(file_path),
-            range=Range(
-                start=Position(line=line_num, character=column),
-                end=Position(line=line_num, character=end_column),
-            ),
-        )
-
     def _get_artifact_info_from_manifest(
         self, document: TextDocument, artifact_name: str
     ) -> dict | None:
@@ -668,20 +1303,13 @@ class ReferencesHandler:
             Dictionary with artifact info, or None.
         """
         try:
-            manifest = json.loads(document.source)
-        except json.JSONDecodeError:
+            manifest = fast_json.loads(document.source)
+        except fast_json.JSONDecodeError:
             return None
-
-        expected_artifacts = manifest.get("expectedArtifacts", {})
-        contains = expected_artifacts.get("contains", [])
-        if not isinstance(contains, list):
+        if not isinstance(manifest, dict):
             return None
 
-        for artifact in contains:
-            if isinstance(artifact, dict) and artifact.get("name") == artifact_name:
-                return artifact
-
-        return None
+        return _find_artifact(manifest, artifact_name)
 
     def _get_artifact_info_from_source(
         self,
@@ -697,23 +1325,17 @@ class ReferencesHandler:
         Returns:
             Dictionary with artifact info, or None.
         """
-        tree = parse_file(source_path)
-        if tree is None:
+        version = _file_version(source_path)
+        if version is None:
             return None
-
-        # Try to determine artifact type by finding it in AST
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef) and node.name == artifact_name:
-                return {"type": "function", "name": artifact_name}
-            if isinstance(node, ast.ClassDef) and node.name == artifact_name:
-                return {"type": "class", "name": artifact_name}
-            # Check for module-level assignments (attributes)
-            if isinstance(node, ast.Assign):
-                for target in node.targets:
-                    if isinstance(target, ast.Name) and target.id == artifact_name:
-                        return {"type": "attribute", "name": artifact_name}
-
-        return None
+        try:
+            # Determine the artifact type from the definitions in the AST
+            artifact_type = _definition_types_cached(*version).get(artifact_name)
+        except (OSError, UnicodeDecodeError):
+            return None
+        if artifact_type is None:
+            return None
+        return {"type": artifact_type, "name": artifact_name}
 
     def _get_word_at_position(self, document: TextDocument, position: Position) -> str | None:
         """Extract the word at the given position.
@@ -725,27 +1347,10 @@ class ReferencesHandler:
         Returns:
             The word at the position, or None if not on a word.
         """
-        lines = document.lines if document.lines else document.source.split("\n")
-        line_num = position.line
-
-        if line_num >= len(lines):
+        current_line = line_at(document.source, position.line)
+        if current_line is None:
             return None
-
-        current_line = lines[line_num]
-        char_pos = position.character
-
-        if char_pos > len(current_line):
-            return None
-
-        # Find word boundaries - include underscore as part of word
-        word_pattern = re.compile(r"[a-zA-Z_][a-zA-Z0-9_]*")
-
-        for match in word_pattern.finditer(current_line):
-            start, end = match.span()
-            if start <= char_pos <= end:
-                return match.group()
-
-        return None
+        return word_at(current_line, position.character)
 
     def _is_manifest_file(self, file_path: Path) -> bool:
         """Check if a file is a manifest file.
@@ -756,9 +1361,7 @@ class ReferencesHandler:
         Returns:
             True if the file is a manifest file, False otherwise.
         """
-        return file_path.name.endswith(".manifest.json") or (
-            "manifests" in file_path.parts and file_path.suffix == ".json"
-        )
+        return is_manifest_file(file_path)
 
     def _uri_to_path(self, uri: str) -> Path:
         """Convert a file URI to a Path object.
@@ -769,10 +1372,7 @@ class ReferencesHandler:
         Returns:
             A Path object.
         """
-        parsed = urlparse(uri)
-        if parsed.scheme == "file":
-            return Path(parsed.path)
-        return Path(uri)
+        return uri_to_path(uri)
 
     def _path_to_uri(self, file_path: Path) -> str:
         """Convert a Path object to a file URI.
@@ -783,7 +1383,7 @@ class ReferencesHandler:
         Returns:
             A file URI string.
         """
-        return f"file://{file_path.resolve()}"
+        return path_to_uri(file_path)
 
     def _deduplicate_locations(self, locations: list[Location]) -> list[Location]:
         """Remove duplicate locations from a list.
@@ -798,17 +1398,11 @@ class ReferencesHandler:
             List of unique Location objects, preserving order.
         """
         seen: set[tuple[str, int, int]] = set()
-        unique_locations: list[Location] = []
-
+        unique: list[Location] = []
         for location in locations:
-            # Create a key from URI, line, and column
-            key = (
-                location.uri,
-                location.range.start.line,
-                location.range.start.character,
-            )
+            # Key each location by URI, line, and column
+            key = (location.uri, location.range.start.line, location.range.start.character)
             if key not in seen:
                 seen.add(key)
-                unique_locations.append(location)
-
-        return unique_locations
+                unique.append(location)
+        return unique
@@ -5,6 +5,7 @@ and registers handlers for document lifecycle and capability features.
 """
 
 from lsprotocol.types import (
+    INITIALIZED,
     TEXT_DOCUMENT_CODE_ACTION,
     TEXT_DOCUMENT_DEFINITION,
     TEXT_DOCUMENT_DID_CHANGE,
@@ -12,15 +13,23 @@ from lsprotocol.types import (
     TEXT_DOCUMENT_DID_OPEN,
     TEXT_DOCUMENT_HOVER,
     TEXT_DOCUMENT_REFERENCES,
+    WORKSPACE_DID_CHANGE_WATCHED_FILES,
     CodeActionParams,
     DefinitionParams,
     DidChangeTextDocumentParams,
+    DidChangeWatchedFilesParams,
+    DidChangeWatchedFilesRegistrationOptions,
     DidCloseTextDocumentParams,
     DidOpenTextDocumentParams,
+    FileChangeType,
+    FileSystemWatcher,
     Hover,
     HoverParams,
+    InitializedParams,
     Location,
     ReferenceParams,
+    Registration,
+    RegistrationParams,
 )
 from pygls.lsp.server import LanguageServer
 
@@ -33,6 +42,9 @@ from maid_lsp.capabilities.references import ReferencesHandler
 from maid_lsp.utils.debounce import Debouncer
 from maid_lsp.validation.runner import MaidRunner
 
+# Files whose changes invalidate the handlers' file system caches
+_WATCHED_FILE_GLOBS = ("**/*.manifest.json", "**/*.py")
+
 
 class MaidLanguageServer(LanguageServer):
     """Main LSP server class that extends pygls LanguageServer.
@@ -91,6 +103,34 @@ def _register_handlers(server: MaidLanguageServer) -> None:
         server: The server instance to register handlers on.
     """
 
+    @server.feature(INITIALIZED)
+    async def _initialized(_params: InitializedParams) -> None:
+        """Handle initialized notification.
+
+        Asks the client to watch manifests and Python sources, since clients
+        only send workspace/didChangeWatchedFiles for registered watchers.
+        """
+        workspace = server.client_capabilities.workspace
+        watched_files = workspace.did_change_watched_files if workspace else None
+        if watched_files is None or not watched_files.dynamic_registration:
+            return
+
+        await server.client_register_capability_async(
+            RegistrationParams(
+                registrations=[
+                    Registration(
+                        id="maid-lsp-watched-files",
+                        method=WORKSPACE_DID_CHANGE_WATCHED_FILES,
+                        register_options=DidChangeWatchedFilesRegistrationOptions(
+                            watchers=[
+                                FileSystemWatcher(glob_pattern=glob) for glob in _WATCHED_FILE_GLOBS
+                            ]
+                        ),
+                    )
+                ]
+            )
+        )
+
     @server.feature(TEXT_DOCUMENT_DID_OPEN)
     async def _did_open(params: DidOpenTextDocumentParams) -> None:
         """Handle textDocument/didOpen notification.
@@ -118,6 +158,24 @@ def _register_handlers(server: MaidLanguageServer) -> None:
         uri = params.text_document.uri
         server.diagnostics_handler.clear_diagnostics(server, uri)
 
+    @server.feature(WORKSPACE_DID_CHANGE_WATCHED_FILES)
+    def _did_change_watched_files(params: DidChangeWatchedFilesParams) -> None:
+        """Handle workspace/didChangeWatchedFiles notification.
+
+        Drops only the cached lookups the changes make stale. The references
+        workspace index notices changed directories by itself, so it is kept.
+        """
+        manifests_changed = any(change.uri.endswith(".manifest.json") for change in params.changes)
+        # Saving a file doesn't change which source paths exist
+        paths_changed = any(change.type != FileChangeType.Changed for change in params.changes)
+
+        if paths_changed:
+            server.definition_handler.clear_path_cache()
+        if manifests_changed:
+            server.references_handler.clear_workspace_cache()
+            # The handlers share one runner
+            server.definition_handler.runner.clear_manifest_cache()
+
     @server.feature(TEXT_DOCUMENT_CODE_ACTION)
     def _code_action(params: CodeActionParams) -> list:
         """Handle textDocument/codeAction request.
@@ -5,9 +5,31 @@ module to locate function, class, and attribute definitions for LSP navigation.
 """
 
 import ast
+import hashlib
+import weakref
+from collections import deque
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
+# Parsed trees by content digest, shared by files with identical bytes (such as a
+# file rewritten without changes) for as long as any cache holds the tree
+_TREES_BY_DIGEST: "weakref.WeakValueDictionary[bytes, ast.Module]" = weakref.WeakValueDictionary()
+
+# Fields holding the nested statement blocks of modules, statements, except
+# handlers and match cases, in the order ast.iter_child_nodes yields them.
+# Definitions only occur in these blocks, so the definition index skips
+# decorators, arguments, annotations, bases and every other expression.
+_BLOCK_FIELDS = ("body", "handlers", "orelse", "finalbody", "cases")
+
+# Field holding the name of each node type a location can span
+_NAME_FIELDS: dict[type[ast.AST], str] = {
+    ast.FunctionDef: "name",
+    ast.AsyncFunctionDef: "name",
+    ast.ClassDef: "name",
+    ast.Name: "id",
+}
+
 
 @dataclass(frozen=True)
 class ArtifactLocation:
@@ -21,28 +43,51 @@ class ArtifactLocation:
         end_column: 0-based column number where the artifact definition ends.
     """
 
+    # Declared by hand rather than with slots=True, so the cached hash gets a
+    # slot without becoming a dataclass field
+    __slots__ = ("file_path", "line", "column", "end_line", "end_column", "_hash")
+
     file_path: Path
     line: int
     column: int
     end_line: int
     end_column: int
 
+    def __post_init__(self) -> None:
+        """Compute the hash once, since the location is immutable."""
+        object.__setattr__(
+            self,
+            "_hash",
+            hash(
+                (
+                    str(self.file_path),
+                    self.line,
+                    self.column,
+                    self.end_line,
+                    self.end_column,
+                )
+            ),
+        )
+
     def __hash__(self) -> int:
         """Make ArtifactLocation hashable by converting Path to string."""
-        return hash(
-            (
-                str(self.file_path),
-                self.line,
-                self.column,
-                self.end_line,
-                self.end_column,
-            )
+        return self._hash  # type: ignore[attr-defined,no-any-return]
+
+    def __reduce__(self) -> tuple[type["ArtifactLocation"], tuple[Path, int, int, int, int]]:
+        """Copy and pickle through the constructor, which recomputes the hash."""
+        return (
+            ArtifactLocation,
+            (self.file_path, self.line, self.column, self.end_line, self.end_column),
         )
 
 
 def parse_file(file_path: Path) -> ast.Module | None:
     """Parse a Python file and return its AST.
 
+    Parsed trees are memoized per file version (path, modification time and
+    size), so repeated lookups in an unchanged file don't re-parse it. The
+    returned tree is shared between callers and must not be modified.
+
     Args:
         file_path: Path to the Python file to parse.
 
@@ -50,11 +95,48 @@ def parse_file(file_path: Path) -> ast.Module | None:
         The AST Module node if parsing succeeds, None otherwise.
     """
     try:
-        with open(file_path, encoding="utf-8") as f:
-            source = f.read()
-        return ast.parse(source, filename=str(file_path))
-    except (OSError, SyntaxError, UnicodeDecodeError):
+        stat = file_path.stat()
+    except OSError:
         return None
+    return _parse_file_cached(str(file_path), stat.st_mtime_ns, stat.st_size)
+
+
+@lru_cache(maxsize=256)
+def _parse_file_cached(
+    path: str,
+    mtime_ns: int,  # noqa: ARG001
+    size: int,  # noqa: ARG001
+) -> ast.Module | None:
+    """Parse a Python file (memoized per file version).
+
+    Files whose contents were parsed before, at this or another path, reuse
+    the earlier tree instead of parsing again.
+
+    Args:
+        path: Path to the Python file.
+        mtime_ns: File modification time in nanoseconds.
+        size: File size in bytes.
+
+    Returns:
+        The AST Module node if parsing succeeds, None otherwise.
+    """
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+
+    digest = hashlib.blake2b(data, digest_size=16).digest()
+    tree = _TREES_BY_DIGEST.get(digest)
+    if tree is not None:
+        return tree
+
+    try:
+        tree = ast.parse(data.decode("utf-8"), filename=path)
+    except (SyntaxError, UnicodeDecodeError, ValueError):
+        return None
+    _TREES_BY_DIGEST[digest] = tree
+    return tree
 
 
 def find_function_definition(
@@ -77,24 +159,10 @@ def find_function_definition(
     if file_path is None:
         return None
 
-    for node in ast.walk(tree):
-        if isinstance(node, ast.FunctionDef):
-            if node.name == name:
-                if class_name is None:
-                    # Module-level function
-                    return _create_location_from_node(node, file_path)
-                # Check if it's a method of the specified class
-                parent = _get_parent_class(node, tree)
-                if parent and parent.name == class_name:
-                    return _create_location_from_node(node, file_path)
-        elif isinstance(node, ast.AsyncFunctionDef) and node.name == name:  # noqa: SIM102
-            if class_name is None:
-                return _create_location_from_node(node, file_path)
-            parent = _get_parent_class(node, tree)
-            if parent and parent.name == class_name:
-                return _create_location_from_node(node, file_path)
-
-    return None
+    node = _definition_index(tree).get(("function", class_name, name))
+    if node is None:
+        return None
+    return _create_location_from_node(node, file_path.resolve())
 
 
 def find_class_definition(
@@ -113,11 +181,10 @@ def find_class_definition(
     if file_path is None:
         return None
 
-    for node in ast.walk(tree):
-        if isinstance(node, ast.ClassDef) and node.name == name:
-            return _create_location_from_node(node, file_path)
-
-    return None
+    node = _definition_index(tree).get(("class", None, name))
+    if node is None:
+        return None
+    return _create_location_from_node(node, file_path.resolve())
 
 
 def find_attribute_definition(
@@ -136,19 +203,10 @@ def find_attribute_definition(
     if file_path is None:
         return None
 
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Assign):
-            for target in node.targets:
-                if isinstance(target, ast.Name) and target.id == name:
-                    return _create_location_from_node(target, file_path)
-        elif (
-            isinstance(node, ast.AnnAssign)
-            and isinstance(node.target, ast.Name)
-            and node.target.id == name
-        ):
-            return _create_location_from_node(node.target, file_path)
-
-    return None
+    node = _definition_index(tree).get(("attribute", None, name))
+    if node is None:
+        return None
+    return _create_location_from_node(node, file_path.resolve())
 
 
 def find_artifact_definition(
@@ -172,67 +230,116 @@ def find_artifact_definition(
     if tree is None:
         return None
 
-    resolved_path = file_path.resolve()
+    # The path is resolved by the lookup, and only once it finds the artifact
     location = None
     if artifact_type == "function":
-        location = find_function_definition(tree, artifact_name, class_name, resolved_path)
+        location = find_function_definition(tree, artifact_name, class_name, file_path)
     elif artifact_type == "class":
-        location = find_class_definition(tree, artifact_name, resolved_path)
+        location = find_class_definition(tree, artifact_name, file_path)
     elif artifact_type == "attribute":
-        location = find_attribute_definition(tree, artifact_name, resolved_path)
+        location = find_attribute_definition(tree, artifact_name, file_path)
 
     return location
 
 
-def _create_location_from_node(node: ast.AST, file_path: Path) -> ArtifactLocation | None:
-    """Create an ArtifactLocation from an AST node.
+@lru_cache(maxsize=256)
+def _definition_index(tree: ast.Module) -> dict[tuple[str, str | None, str], ast.stmt | ast.expr]:
+    """Index the definitions of a module (memoized per tree).
 
     Args:
-        node: The AST node representing the artifact.
-        file_path: Path to the source file.
+        tree: The AST module to index.
 
     Returns:
-        ArtifactLocation with position information.
+        Mapping of definition keys to their nodes, as built by _index_definitions.
     """
-    if not hasattr(node, "lineno") or not hasattr(node, "col_offset"):
-        return None
+    return _index_definitions(tree)
 
-    line = node.lineno - 1  # Convert to 0-based
-    column = node.col_offset
 
-    # Calculate end position
-    end_line = line
-    end_column = column
+def _index_definitions(tree: ast.Module) -> dict[tuple[str, str | None, str], ast.stmt | ast.expr]:
+    """Index the function, class and attribute definitions of a module.
 
-    if isinstance(node, ast.FunctionDef | ast.AsyncFunctionDef | ast.ClassDef):
-        # For definitions, use the name length
-        name_length = len(node.name)
-        end_column = column + name_length
-    elif isinstance(node, ast.Name):
-        end_column = column + len(node.id)
+    Statement blocks are walked once, breadth-first like ast.walk, carrying
+    the outermost enclosing class along; expression subtrees are never
+    entered since they can't contain definitions. Keys are ("function", class name or None,
+    name), ("class", None, name) and ("attribute", None, name); the first
+    definition in walk order wins, so lookups match what a search with
+    ast.walk would return.
 
-    return ArtifactLocation(
-        file_path=file_path.resolve(),
-        line=line,
-        column=column,
-        end_line=end_line,
-        end_column=end_column,
-    )
+    Args:
+        tree: The AST module to index.
+
+    Returns:
+        Mapping of definition keys to their nodes (attribute targets for
+        attributes).
+    """
+    index: dict[tuple[str, str | None, str], ast.stmt | ast.expr] = {}
+    queue: deque[tuple[ast.AST, str | None]] = deque([(tree, None)])
+    while queue:
+        node, enclosing_class = queue.popleft()
+        child_class = enclosing_class
+        # AST node classes are never subclassed, so exact type checks suffice
+        if type(node) is ast.FunctionDef or type(node) is ast.AsyncFunctionDef:
+            index.setdefault(("function", None, node.name), node)
+            if enclosing_class is not None:
+                index.setdefault(("function", enclosing_class, node.name), node)
+        elif type(node) is ast.ClassDef:
+            index.setdefault(("class", None, node.name), node)
+            if enclosing_class is None:
+                child_class = node.name
+        elif type(node) is ast.Assign:
+            for target in node.targets:
+                if type(target) is ast.Name:
+                    index.setdefault(("attribute", None, target.id), target)
+        elif type(node) is ast.AnnAssign and type(node.target) is ast.Name:
+            index.setdefault(("attribute", None, node.target.id), node.target)
+        for field_name in _BLOCK_FIELDS:
+            block = getattr(node, field_name, None)
+            if block:
+                queue.extend((child, child_class) for child in block)
+
+    return index
 
 
-def _get_parent_class(node: ast.AST, tree: ast.Module) -> ast.ClassDef | None:
-    """Get the parent class of a node if it's a method.
+def _definition_types(tree: ast.Module) -> dict[str, str]:
+    """Find how each name in a module is defined.
+
+    Derived from the definition index, whose keys are in walk order, so a name
+    defined several ways gets the type of its first definition. The index isn't
+    memoized here, so the tree isn't kept alive; callers cache the result.
 
     Args:
-        node: The AST node (should be a function/method).
         tree: The AST module to search.
 
     Returns:
-        The parent ClassDef node if found, None otherwise.
+        Mapping of each defined name to "function", "class" or "attribute".
     """
-    for parent in ast.walk(tree):
-        if isinstance(parent, ast.ClassDef):
-            for child in ast.walk(parent):
-                if child is node and isinstance(child, ast.FunctionDef | ast.AsyncFunctionDef):
-                    return parent
-    return None
+    types: dict[str, str] = {}
+    for artifact_type, _, name in _index_definitions(tree):
+        types.setdefault(name, artifact_type)
+    return types
+
+
+def _create_location_from_node(node: ast.stmt | ast.expr, file_path: Path) -> ArtifactLocation:
+    """Create an ArtifactLocation from an AST node.
+
+    Args:
+        node: The AST node representing the artifact.
+        file_path: Resolved path to the source file.
+
+    Returns:
+        ArtifactLocation with position information.
+    """
+    line = node.lineno - 1  # Convert to 0-based
+    column = node.col_offset
+
+    # Definitions and names span their name, other nodes just their start
+    name_field = _NAME_FIELDS.get(type(node))
+    end_column = column + len(getattr(node, name_field)) if name_field else column
+
+    return ArtifactLocation(
+        file_path=file_path,
+        line=line,
+        column=column,
+        end_line=line,
+        end_column=end_column,
+    )
@@ -86,3 +86,33 @@ class Debouncer:
         for task in self._tasks.values():
             task.cancel()
         self._tasks.clear()
+
+
+async def wait_superseded(debouncer: Debouncer, key: str) -> bool:
+    """Wait out the debounce delay for a key.
+
+    Unlike debounce, a newer call for the same key is reported rather than
+    raised, while any other cancellation (such as the calling task being
+    cancelled) still propagates.
+
+    Args:
+        debouncer: The debouncer to wait on.
+        key: A unique identifier for this debounce group.
+
+    Returns:
+        True if a newer call for the key superseded this one, False once the
+        delay passed.
+
+    Raises:
+        asyncio.CancelledError: If the wait was cancelled other than by a
+            newer call for the key.
+    """
+    try:
+        await debouncer.debounce(key, lambda: asyncio.sleep(0))
+    except asyncio.CancelledError:
+        # A superseding call has registered its own pending task for the key;
+        # cancelling this wait otherwise leaves no task behind
+        if key not in debouncer._tasks:
+            raise
+        return True
+    return False
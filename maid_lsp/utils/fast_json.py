@@ -0,0 +1,34 @@
+"""JSON decoding with an optional fast backend.
+
+This module exposes a loads function that uses orjson when it is installed
+and falls back to the standard library json module otherwise. Both backends
+raise json.JSONDecodeError (orjson's error type subclasses it) on bad input.
+"""
+
+import json
+from collections.abc import Callable
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None  # type: ignore[assignment]
+
+JSONDecodeError = json.JSONDecodeError
+
+_loads: Callable[[str | bytes], Any] = orjson.loads if orjson is not None else json.loads
+
+
+def loads(data: str | bytes) -> Any:
+    """Decode a JSON document.
+
+    Args:
+        data: The JSON document as text or UTF-8 encoded bytes.
+
+    Returns:
+        The decoded Python object.
+
+    Raises:
+        json.JSONDecodeError: If the document is not valid JSON.
+    """
+    return _loads(data)
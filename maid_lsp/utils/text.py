@@ -0,0 +1,87 @@
+"""Line and word lookups in document text.
+
+This module provides line_at, which returns a single line of a document
+through a memoized table of line start offsets, so repeated requests
+against an unchanged document don't rescan the text up to the cursor, and
+word_at, which extracts the identifier under the cursor from a line.
+"""
+
+import string
+from functools import lru_cache
+
+# Characters that make up an identifier
+_WORD_CHARS = frozenset(string.ascii_letters + string.digits + "_")
+
+
+@lru_cache(maxsize=32)
+def _line_starts(source: str) -> tuple[int, ...]:
+    """Compute the offset at which each line of a document starts (memoized).
+
+    The key is the document text itself, so repeated requests against an
+    unchanged document reuse the table.
+
+    Args:
+        source: The document text.
+
+    Returns:
+        The offset of the first character of each line.
+    """
+    starts = [0]
+    find = source.find
+    newline = find("\n")
+    while newline != -1:
+        starts.append(newline + 1)
+        newline = find("\n", newline + 1)
+    return tuple(starts)
+
+
+def line_at(source: str, line_num: int) -> str | None:
+    """Return a single line of a document without splitting the whole text.
+
+    Args:
+        source: The document text.
+        line_num: Zero-based line number.
+
+    Returns:
+        The line without its line terminator, or None if out of range.
+    """
+    starts = _line_starts(source)
+    if line_num >= len(starts):
+        return None
+    start = starts[line_num]
+    end = starts[line_num + 1] - 1 if line_num + 1 < len(starts) else len(source)
+    line = source[start:end]
+    return line[:-1] if line.endswith("\r") else line
+
+
+def word_at(line: str, character: int) -> str | None:
+    """Return the identifier at or touching a position in a line.
+
+    The scan goes outwards from the cursor, so long lines cost no more than
+    the word under the cursor.
+
+    Args:
+        line: The line of text, without its line terminator.
+        character: Zero-based character position within the line.
+
+    Returns:
+        The word at the position, or None if not on a word.
+    """
+    if character < 0 or character > len(line):
+        return None
+
+    start = character
+    while start > 0 and line[start - 1] in _WORD_CHARS:
+        start -= 1
+    end = character
+    while end < len(line) and line[end] in _WORD_CHARS:
+        end += 1
+
+    # Identifiers can't start with a digit
+    while start < end and line[start].isdigit():
+        start += 1
+
+    if start == end or start > character:
+        return None
+
+    return line[start:end]
@@ -0,0 +1,70 @@
+"""File URIs and paths shared by the capability handlers.
+
+This module provides path_to_uri and uri_to_path, which the capability handlers
+use to convert between document URIs and file paths, and is_manifest_file, which
+tells manifests from source files. Keeping them in one place means the same file
+always gets the same URI and classification whichever request handled it.
+"""
+
+import os
+from functools import lru_cache
+from pathlib import Path
+from urllib.parse import unquote, urlparse
+
+
+@lru_cache(maxsize=4096)
+def path_to_uri(file_path: Path) -> str:
+    """Convert a path to a file URI (memoized).
+
+    Relative paths are made absolute against the working directory and the path
+    is normalized, without resolving symlinks. The path is always percent-encoded
+    (RFC 8089), so uri_to_path converts the URI back to the same path.
+
+    Args:
+        file_path: The file path.
+
+    Returns:
+        A file URI string.
+    """
+    # abspath normalizes without the lstat calls that resolve() makes
+    return Path(os.path.abspath(file_path)).as_uri()
+
+
+@lru_cache(maxsize=1024)
+def uri_to_path(uri: str) -> Path:
+    """Convert a file URI to a Path object (memoized).
+
+    Percent-encoded characters in the URI path are decoded.
+
+    Args:
+        uri: The file URI.
+
+    Returns:
+        A Path object.
+    """
+    # Plain local file URIs don't need the full URL parser
+    if uri.startswith("file:///") and "?" not in uri and "#" not in uri:
+        return Path(unquote(uri[len("file://") :]))
+    parsed = urlparse(uri)
+    if parsed.scheme == "file":
+        return Path(unquote(parsed.path))
+    return Path(uri)
+
+
+@lru_cache(maxsize=4096)
+def is_manifest_file(file_path: Path) -> bool:
+    """Check if a file is a manifest file (memoized).
+
+    Args:
+        file_path: Path to check.
+
+    Returns:
+        True if the file is a manifest file, False otherwise.
+    """
+    path_str = os.fspath(file_path)
+    if path_str.endswith(".manifest.json"):
+        return True
+    if not path_str.endswith(".json"):
+        return False
+    # Any .json file under a "manifests" directory component
+    return f"{os.sep}manifests{os.sep}" in f"{os.sep}{path_str}"
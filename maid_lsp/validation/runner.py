@@ -5,6 +5,8 @@ for validation operations using asyncio thread execution.
 """
 
 import asyncio
+import threading
+import time
 from pathlib import Path
 
 from maid_runner import ManifestChain
@@ -13,6 +15,35 @@ from maid_runner import validate as maid_validate
 
 from maid_lsp.validation.models import ValidationError, ValidationMode, ValidationResult
 
+# Manifest file names that ManifestChain discovers
+_MANIFEST_PATTERNS = ("*.manifest.yaml", "*.manifest.yml", "*.manifest.json")
+
+# Sorted (path, modification time in nanoseconds, size) of each manifest
+_ManifestFingerprint = tuple[tuple[str, int, int], ...]
+
+# Seconds a manifest fingerprint is trusted without walking the workspace again
+_FINGERPRINT_TTL = 2.0
+
+
+def _manifest_fingerprint(root: Path) -> _ManifestFingerprint:
+    """Identify the manifests below a directory and their current versions.
+
+    Args:
+        root: Directory to search for manifests.
+
+    Returns:
+        The fingerprint of the manifests found.
+    """
+    entries: list[tuple[str, int, int]] = []
+    for pattern in _MANIFEST_PATTERNS:
+        for path in root.rglob(pattern):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((str(path), stat.st_mtime_ns, stat.st_size))
+    return tuple(sorted(entries))
+
 
 class MaidRunner:
     """Async wrapper for maid-runner library.
@@ -35,6 +66,20 @@ class MaidRunner:
             timeout: Timeout in seconds for validation operations. Defaults to 10.0.
         """
         self.timeout = timeout
+        # (workspace root, manifest fingerprint, chain) from the last lookup;
+        # the lock also serializes the chain's lazy loading
+        self._chain_cache: tuple[Path, _ManifestFingerprint, ManifestChain] | None = None
+        self._chain_lock = threading.Lock()
+        # (workspace root, expiry time, fingerprint) of the last workspace walk
+        self._fingerprint_cache: tuple[Path, float, _ManifestFingerprint] | None = None
+
+    def clear_manifest_cache(self) -> None:
+        """Forget the manifests found by the last workspace walk.
+
+        Called when the client reports file system changes so that the next
+        lookup walks the workspace instead of waiting for the cache to expire.
+        """
+        self._fingerprint_cache = None
 
     async def validate(
         self,
@@ -102,6 +147,10 @@ class MaidRunner:
         """Find manifests associated with a source file.
 
         Uses ManifestChain to discover manifest files related to the given source file.
+        The chain is reused across calls until a manifest is added, removed or
+        modified, so the manifests aren't loaded again for every lookup. The
+        workspace is walked for such changes at most every couple of seconds,
+        or on the next lookup after clear_manifest_cache.
 
         Args:
             file_path: Path to the source file.
@@ -114,8 +163,22 @@ class MaidRunner:
         """
 
         def _find() -> list[str]:
-            chain = ManifestChain(str(Path.cwd()))
-            return [str(m) for m in chain.manifests_for_file(str(file_path))]
+            root = Path.cwd()
+            now = time.monotonic()
+            walked = self._fingerprint_cache
+            if walked is not None and walked[0] == root and walked[1] > now:
+                fingerprint = walked[2]
+            else:
+                fingerprint = _manifest_fingerprint(root)
+                self._fingerprint_cache = (root, now + _FINGERPRINT_TTL, fingerprint)
+            with self._chain_lock:
+                cached = self._chain_cache
+                if cached is not None and cached[0] == root and cached[1] == fingerprint:
+                    chain = cached[2]
+                else:
+                    chain = ManifestChain(str(root))
+                    self._chain_cache = (root, fingerprint, chain)
+                return [str(m) for m in chain.manifests_for_file(str(file_path))]
 
         result = await asyncio.wait_for(
             asyncio.to_thread(_find),
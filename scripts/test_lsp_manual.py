@@ -70,22 +70,26 @@ async def test_manifest(manifest_path: Path) -> None:
         artifacts = []
 
     # Find artifact names and their positions in the file
+    # (the quoted search strings are built once, not for every line)
+    needles = [
+        (artifact_name, f'"{artifact_name}"', f"'{artifact_name}'")
+        for artifact in artifacts
+        if isinstance(artifact, dict) and (artifact_name := artifact.get("name"))
+    ]
     lines = content.splitlines()
     artifact_positions = []
     for i, line in enumerate(lines):
         # Look for artifact names (like "__version__", "__all__")
-        for artifact in artifacts:
-            if isinstance(artifact, dict):
-                artifact_name = artifact.get("name")
-                if artifact_name and artifact_name in line:
-                    # Find the character position of the artifact name
-                    char_pos = line.find(f'"{artifact_name}"')
-                    if char_pos == -1:
-                        char_pos = line.find(f"'{artifact_name}'")
-                    if char_pos != -1:
-                        # Position is inside the quotes, adjust to the name itself
-                        artifact_positions.append((i, char_pos + 1, artifact_name))
-                        break
+        for artifact_name, double_quoted, single_quoted in needles:
+            if artifact_name in line:
+                # Find the character position of the artifact name
+                char_pos = line.find(double_quoted)
+                if char_pos == -1:
+                    char_pos = line.find(single_quoted)
+                if char_pos != -1:
+                    # Position is inside the quotes, adjust to the name itself
+                    artifact_positions.append((i, char_pos + 1, artifact_name))
+                    break
 
     # Test hover on artifact names
     print("\n2. Testing hover on artifact names...")
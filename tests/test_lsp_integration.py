@@ -5,14 +5,36 @@ real LSP protocol behavior with actual manifest files.
 """
 
 import asyncio
+import itertools
 import json
+from operator import attrgetter
 from pathlib import Path
 from typing import Any
 
 import pytest
+from lsprotocol.types import (
+    DefinitionParams,
+    HoverParams,
+    Position,
+    PublishDiagnosticsParams,
+    ReferenceContext,
+    ReferenceParams,
+    TextDocumentContentChangeWholeDocument,
+    TextDocumentIdentifier,
+    TextDocumentItem,
+    VersionedTextDocumentIdentifier,
+)
+from pygls.workspace import Workspace
 
 from maid_lsp.server import create_server
 
+# Position-based requests: method -> (params class, server handler method, is async)
+_POSITION_REQUESTS: dict[str, tuple[type[Any], str, bool]] = {
+    "textDocument/hover": (HoverParams, "hover_handler.get_hover", False),
+    "textDocument/definition": (DefinitionParams, "definition_handler.get_definition_async", True),
+    "textDocument/references": (ReferenceParams, "references_handler.get_references", True),
+}
+
 
 class LSPTestClient:
     """Simple LSP client for testing the server."""
@@ -20,14 +42,18 @@ class LSPTestClient:
     def __init__(self, server: Any) -> None:
         """Initialize test client with server instance."""
         self.server = server
-        self.request_id = 1
+        self._request_ids = itertools.count(1)
         self.responses: dict[int, Any] = {}
-        self.documents: dict[str, str] = {}  # Store document content by URI
+        # Open documents, kept apart from the workspace of the shared server
+        self.workspace = Workspace(None)
+        # Diagnostics published by validations, in publishing order
+        self.published_diagnostics: asyncio.Queue[PublishDiagnosticsParams] = asyncio.Queue()
+        # Validations started by didOpen/didChange that haven't been awaited yet
+        self._pending_validations: set[asyncio.Task[None]] = set()
 
     async def send_request(self, method: str, params: dict[str, Any] | None = None) -> Any:
         """Send an LSP request and wait for response."""
-        request_id = self.request_id
-        self.request_id += 1
+        request_id = next(self._request_ids)
 
         request = {
             "jsonrpc": "2.0",
@@ -41,10 +67,43 @@ class LSPTestClient:
         # This is a simplified approach - in real testing you'd use the full protocol
         return await self._handle_request(method, params or {})
 
+    async def send_requests_batch(
+        self, requests: list[tuple[str, dict[str, Any] | None]]
+    ) -> list[Any]:
+        """Send several LSP requests concurrently and return their responses in order."""
+        return list(
+            await asyncio.gather(
+                *(self._handle_request(method, params or {}) for method, params in requests)
+            )
+        )
+
+    async def load_document(self, uri: str, text: str) -> None:
+        """Make a document available to requests without validating it."""
+        self.workspace.put_text_document(
+            TextDocumentItem(uri=uri, language_id="json", version=1, text=text)
+        )
+
     async def send_notification(self, method: str, params: dict[str, Any] | None = None) -> None:
         """Send an LSP notification (no response expected)."""
         await self._handle_notification(method, params or {})
 
+    async def wait_for_validation(self, timeout: float = 2.0) -> None:
+        """Wait until the validations triggered by notifications are done.
+
+        Raises:
+            TimeoutError: If a validation is still running after the timeout.
+        """
+        pending, self._pending_validations = self._pending_validations, set()
+        if not pending:
+            return
+        done, not_done = await asyncio.wait(pending, timeout=timeout)
+        if not_done:
+            for task in not_done:
+                task.cancel()
+            raise TimeoutError("Validation did not finish in time")
+        for task in done:
+            task.result()  # Re-raise any validation error
+
     async def _handle_request(self, method: str, params: dict[str, Any]) -> Any:
         """Handle request by calling server handlers directly."""
         # Map LSP methods to server handlers
@@ -60,76 +119,43 @@ class LSPTestClient:
                     }
                 }
             }
-        elif method == "textDocument/hover":
-            from lsprotocol.types import HoverParams, Position, TextDocumentIdentifier
-            from pygls.workspace import TextDocument
-
-            uri = params["textDocument"]["uri"]
-            content = self.documents.get(uri, "")
-            doc = TextDocument(uri, content, language_id="json")
-
-            hover_params = HoverParams(
-                text_document=TextDocumentIdentifier(uri=uri),
-                position=Position(
-                    line=params["position"]["line"],
-                    character=params["position"]["character"],
-                ),
-            )
-            return self.server.hover_handler.get_hover(hover_params, doc)
-        elif method == "textDocument/definition":
-            from lsprotocol.types import (
-                DefinitionParams,
-                Position,
-                TextDocumentIdentifier,
-            )
-            from pygls.workspace import TextDocument
-
-            uri = params["textDocument"]["uri"]
-            content = self.documents.get(uri, "")
-            doc = TextDocument(uri, content, language_id="json")
-
-            def_params = DefinitionParams(
-                text_document=TextDocumentIdentifier(uri=uri),
-                position=Position(
-                    line=params["position"]["line"],
-                    character=params["position"]["character"],
-                ),
-            )
-            return await self.server.definition_handler.get_definition_async(def_params, doc)
-        elif method == "textDocument/references":
-            from lsprotocol.types import (
-                Position,
-                ReferenceParams,
-                TextDocumentIdentifier,
-            )
-            from pygls.workspace import TextDocument
 
-            uri = params["textDocument"]["uri"]
-            content = self.documents.get(uri, "")
-            doc = TextDocument(uri, content, language_id="json")
-
-            ref_params = ReferenceParams(
-                text_document=TextDocumentIdentifier(uri=uri),
-                position=Position(
-                    line=params["position"]["line"],
-                    character=params["position"]["character"],
-                ),
-                context={
-                    "includeDeclaration": params.get("context", {}).get("includeDeclaration", True)
-                },
+        request = _POSITION_REQUESTS.get(method)
+        if request is None:
+            return None
+        params_class, handler_path, is_async = request
+
+        uri = params["textDocument"]["uri"]
+        request_params: dict[str, Any] = {
+            "text_document": TextDocumentIdentifier(uri=uri),
+            "position": Position(
+                line=params["position"]["line"],
+                character=params["position"]["character"],
+            ),
+        }
+        if params_class is ReferenceParams:
+            request_params["context"] = ReferenceContext(
+                include_declaration=params.get("context", {}).get("includeDeclaration", True)
             )
-            return await self.server.references_handler.get_references(ref_params, doc)
 
-        return None
+        handler = attrgetter(handler_path)(self.server)
+        result = handler(params_class(**request_params), self.workspace.get_text_document(uri))
+        return await result if is_async else result
 
     async def _handle_notification(self, method: str, params: dict[str, Any]) -> None:
         """Handle notification by calling server handlers directly."""
         if method == "textDocument/didOpen":
-            uri = params["textDocument"]["uri"]
-            text = params["textDocument"]["text"]
-            # Store document content
-            self.documents[uri] = text
-            await self.server.diagnostics_handler.validate_and_publish(self.server, uri)
+            document = params["textDocument"]
+            uri = document["uri"]
+            self.workspace.put_text_document(
+                TextDocumentItem(
+                    uri=uri,
+                    language_id=document["languageId"],
+                    version=document["version"],
+                    text=document["text"],
+                )
+            )
+            self._validate(uri)
         elif method == "textDocument/didChange":
             uri = params["textDocument"]["uri"]
             # Update document content from changes
@@ -140,40 +166,70 @@ class LSPTestClient:
                 and "text" in content_changes[0]
             ):
                 # For simplicity, assume full document replacement
-                self.documents[uri] = content_changes[0]["text"]
-            await self.server.diagnostics_handler.validate_and_publish(self.server, uri)
-
-
-@pytest.mark.asyncio
+                self.workspace.update_text_document(
+                    VersionedTextDocumentIdentifier(
+                        uri=uri, version=params["textDocument"].get("version", 0)
+                    ),
+                    TextDocumentContentChangeWholeDocument(text=content_changes[0]["text"]),
+                )
+            self._validate(uri)
+
+    def text_document_publish_diagnostics(self, params: PublishDiagnosticsParams) -> None:
+        """Capture diagnostics that a validation publishes to the client."""
+        self.published_diagnostics.put_nowait(params)
+
+    def _validate(self, uri: str) -> None:
+        """Start the server's validation for a document without waiting for it.
+
+        The client stands in for the server as the publisher, so diagnostics land
+        in this client's queue rather than going out on the shared server.
+        """
+        task = asyncio.create_task(self.server.diagnostics_handler.validate_and_publish(self, uri))
+        self._pending_validations.add(task)
+
+
+@pytest.fixture(scope="module")
+def server() -> Any:
+    """Create a test server instance shared by the tests in this module.
+
+    Handler caches revalidate against the file system, so one server can
+    serve every test; each test still gets its own client and documents.
+    """
+    return create_server()
+
+
+@pytest.fixture(scope="session")
+def sample_manifest(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Create a sample manifest file shared by the tests, which only read it."""
+    manifest_path = tmp_path_factory.mktemp("manifests") / "test.manifest.json"
+    manifest_content = {
+        "goal": "Test manifest for LSP integration",
+        "taskType": "create",
+        "creatableFiles": ["test.py"],
+        "expectedArtifacts": {
+            "file": "test.py",
+            "contains": [{"type": "function", "name": "test_function"}],
+        },
+    }
+    manifest_path.write_text(json.dumps(manifest_content, indent=2))
+    return manifest_path
+
+
+@pytest.fixture(scope="session")
+def sample_manifest_text(sample_manifest: Path) -> str:
+    """Read the sample manifest once for the tests that open it."""
+    return sample_manifest.read_text()
+
+
+@pytest.mark.asyncio(loop_scope="module")
 class TestLSPIntegration:
     """End-to-end integration tests with real LSP protocol."""
 
-    @pytest.fixture
-    def server(self) -> Any:
-        """Create a test server instance."""
-        return create_server()
-
     @pytest.fixture
     def client(self, server: Any) -> LSPTestClient:
         """Create a test client."""
         return LSPTestClient(server)
 
-    @pytest.fixture
-    def sample_manifest(self, tmp_path: Path) -> Path:
-        """Create a sample manifest file for testing."""
-        manifest_path = tmp_path / "test.manifest.json"
-        manifest_content = {
-            "goal": "Test manifest for LSP integration",
-            "taskType": "create",
-            "creatableFiles": ["test.py"],
-            "expectedArtifacts": {
-                "file": "test.py",
-                "contains": [{"type": "function", "name": "test_function"}],
-            },
-        }
-        manifest_path.write_text(json.dumps(manifest_content, indent=2))
-        return manifest_path
-
     async def test_server_initialization(self, server: Any) -> None:
         """Test that server initializes correctly."""
         assert server is not None
@@ -184,7 +240,7 @@ class TestLSPIntegration:
         assert server.references_handler is not None
 
     async def test_document_open_triggers_validation(
-        self, client: LSPTestClient, sample_manifest: Path
+        self, client: LSPTestClient, sample_manifest: Path, sample_manifest_text: str
     ) -> None:
         """Test that opening a document triggers validation."""
         uri = f"file://{sample_manifest}"
@@ -197,40 +253,27 @@ class TestLSPIntegration:
                     "uri": uri,
                     "languageId": "json",
                     "version": 1,
-                    "text": sample_manifest.read_text(),
+                    "text": sample_manifest_text,
                 }
             },
         )
 
-        # Wait a bit for async validation to complete
-        await asyncio.sleep(0.2)
+        # Wait for validation to complete
+        await client.wait_for_validation()
 
-        # Check that diagnostics were published (would be in server's published diagnostics)
-        # In a real test, you'd capture the publishDiagnostics notifications
-        assert True  # Placeholder - actual test would verify diagnostics
+        diagnostics = client.published_diagnostics.get_nowait()
+        assert isinstance(diagnostics, PublishDiagnosticsParams)
+        assert diagnostics.uri == uri
+        assert isinstance(diagnostics.diagnostics, list)
 
     async def test_hover_on_artifact_reference(
-        self, client: LSPTestClient, sample_manifest: Path
+        self, client: LSPTestClient, sample_manifest: Path, sample_manifest_text: str
     ) -> None:
         """Test hover functionality on artifact references."""
         uri = f"file://{sample_manifest}"
-        content = sample_manifest.read_text()
-
-        # Open document first
-        await client.send_notification(
-            "textDocument/didOpen",
-            {
-                "textDocument": {
-                    "uri": uri,
-                    "languageId": "json",
-                    "version": 1,
-                    "text": content,
-                }
-            },
-        )
 
-        # Wait for document to be processed
-        await asyncio.sleep(0.1)
+        # Requests don't need the document validated first
+        await client.load_document(uri, sample_manifest_text)
 
         # Request hover at a position (adjust line/character based on content)
         hover_result = await client.send_request(
@@ -245,25 +288,14 @@ class TestLSPIntegration:
         # This is expected behavior
         assert hover_result is None or isinstance(hover_result, dict)
 
-    async def test_definition_lookup(self, client: LSPTestClient, sample_manifest: Path) -> None:
+    async def test_definition_lookup(
+        self, client: LSPTestClient, sample_manifest: Path, sample_manifest_text: str
+    ) -> None:
         """Test go-to-definition functionality."""
         uri = f"file://{sample_manifest}"
-        content = sample_manifest.read_text()
 
-        # Open document
-        await client.send_notification(
-            "textDocument/didOpen",
-            {
-                "textDocument": {
-                    "uri": uri,
-                    "languageId": "json",
-                    "version": 1,
-                    "text": content,
-                }
-            },
-        )
-
-        await asyncio.sleep(0.1)
+        # Requests don't need the document validated first
+        await client.load_document(uri, sample_manifest_text)
 
         # Request definition
         definition_result = await client.send_request(
@@ -277,25 +309,14 @@ class TestLSPIntegration:
         # Definition might be None if position doesn't have a definition
         assert definition_result is None or isinstance(definition_result, dict | list)
 
-    async def test_references_lookup(self, client: LSPTestClient, sample_manifest: Path) -> None:
+    async def test_references_lookup(
+        self, client: LSPTestClient, sample_manifest: Path, sample_manifest_text: str
+    ) -> None:
         """Test find-references functionality."""
         uri = f"file://{sample_manifest}"
-        content = sample_manifest.read_text()
 
-        # Open document
-        await client.send_notification(
-            "textDocument/didOpen",
-            {
-                "textDocument": {
-                    "uri": uri,
-                    "languageId": "json",
-                    "version": 1,
-                    "text": content,
-                }
-            },
-        )
-
-        await asyncio.sleep(0.1)
+        # Requests don't need the document validated first
+        await client.load_document(uri, sample_manifest_text)
 
         # Request references
         references_result = await client.send_request(
@@ -310,16 +331,33 @@ class TestLSPIntegration:
         # Should return a list (empty if no references found)
         assert isinstance(references_result, list)
 
+    async def test_batched_requests(
+        self, client: LSPTestClient, sample_manifest: Path, sample_manifest_text: str
+    ) -> None:
+        """Test that concurrent requests on one document each get their response."""
+        uri = f"file://{sample_manifest}"
+
+        # Requests don't need the document validated first
+        await client.load_document(uri, sample_manifest_text)
 
-@pytest.mark.asyncio
+        position = {"textDocument": {"uri": uri}, "position": {"line": 5, "character": 10}}
+        hover_result, definition_result, references_result = await client.send_requests_batch(
+            [
+                ("textDocument/hover", position),
+                ("textDocument/definition", position),
+                ("textDocument/references", {**position, "context": {"includeDeclaration": True}}),
+            ]
+        )
+
+        assert hover_result is None or isinstance(hover_result, dict)
+        assert definition_result is None or isinstance(definition_result, dict | list)
+        assert isinstance(references_result, list)
+
+
+@pytest.mark.asyncio(loop_scope="module")
 class TestLSPWithRealManifests:
     """Test LSP server with actual manifest files from the project."""
 
-    @pytest.fixture
-    def server(self) -> Any:
-        """Create a test server instance."""
-        return create_server()
-
     @pytest.fixture
     def client(self, server: Any) -> LSPTestClient:
         """Create a test client."""
@@ -352,8 +390,8 @@ class TestLSPWithRealManifests:
         )
 
         # Wait for validation (with debouncing)
-        await asyncio.sleep(0.3)
+        await client.wait_for_validation()
 
-        # In a real scenario, you'd capture and verify the diagnostics
-        # For now, just verify the server processed it without crashing
-        assert True
+        diagnostics = client.published_diagnostics.get_nowait()
+        assert diagnostics.uri == uri
+        assert client.published_diagnostics.empty()
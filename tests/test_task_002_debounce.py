@@ -11,7 +11,7 @@ from unittest.mock import AsyncMock
 
 import pytest
 
-from maid_lsp.utils.debounce import Debouncer
+from maid_lsp.utils.debounce import Debouncer, wait_superseded
 
 
 class TestDebouncerInit:
@@ -163,3 +163,32 @@ class TestDebouncerCancelAll:
 
         # Should not raise
         debouncer.cancel_all()
+
+
+class TestWaitSuperseded:
+    """Test the wait_superseded helper."""
+
+    @pytest.mark.asyncio
+    async def test_reports_newer_call_for_key(self) -> None:
+        """Only the last of rapid waits on a key should run to completion."""
+        debouncer = Debouncer(delay_ms=10.0)
+
+        results = await asyncio.gather(
+            wait_superseded(debouncer, "key1"),
+            wait_superseded(debouncer, "key1"),
+        )
+
+        assert results == [True, False]
+
+    @pytest.mark.asyncio
+    async def test_propagates_cancellation_of_caller(self) -> None:
+        """Cancelling the waiting task itself should not be reported as superseded."""
+        debouncer = Debouncer(delay_ms=1000.0)  # Long delay
+        task = asyncio.create_task(wait_superseded(debouncer, "key1"))
+
+        # Give it a moment to register
+        await asyncio.sleep(0.01)
+        task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await task
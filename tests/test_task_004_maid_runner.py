@@ -410,3 +410,55 @@ class TestMaidRunnerFindManifests:
 
         assert len(result) == 1
         assert result[0] == Path("/project/manifests/task-001.manifest.json")
+
+    @pytest.mark.asyncio
+    async def test_find_manifests_reuses_chain_until_manifests_change(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Find manifests should load the chain again only after a manifest changes."""
+        manifest_path = tmp_path / "task-001.manifest.json"
+        manifest_path.write_text("{}")
+        monkeypatch.chdir(tmp_path)
+        runner = MaidRunner()
+
+        mock_chain = MagicMock()
+        mock_chain.manifests_for_file.return_value = []
+
+        with patch(
+            "maid_lsp.validation.runner.ManifestChain", return_value=mock_chain
+        ) as chain_class:
+            await runner.find_manifests(Path("src/a.py"))
+            await runner.find_manifests(Path("src/b.py"))
+            assert chain_class.call_count == 1
+
+            manifest_path.write_text('{"goal": "changed"}')
+            runner.clear_manifest_cache()
+            await runner.find_manifests(Path("src/a.py"))
+            assert chain_class.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_find_manifests_walks_workspace_again_after_ttl(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Find manifests should trust the last workspace walk for a short time."""
+        (tmp_path / "task-001.manifest.json").write_text("{}")
+        monkeypatch.chdir(tmp_path)
+        runner = MaidRunner()
+
+        mock_chain = MagicMock()
+        mock_chain.manifests_for_file.return_value = []
+
+        with (
+            patch("maid_lsp.validation.runner.ManifestChain", return_value=mock_chain),
+            patch(
+                "maid_lsp.validation.runner._manifest_fingerprint", return_value=()
+            ) as fingerprint,
+            patch("maid_lsp.validation.runner.time.monotonic", return_value=100.0) as clock,
+        ):
+            await runner.find_manifests(Path("src/a.py"))
+            await runner.find_manifests(Path("src/b.py"))
+            assert fingerprint.call_count == 1
+
+            clock.return_value = 103.0
+            await runner.find_manifests(Path("src/a.py"))
+            assert fingerprint.call_count == 2
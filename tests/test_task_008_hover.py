@@ -233,6 +233,39 @@ class TestHoverHandlerGetHover:
         # Should handle gracefully and return None
         assert result is None
 
+    def test_get_hover_on_crlf_document(self) -> None:
+        """get_hover should read the hovered line directly from CRLF sources."""
+        handler = HoverHandler()
+
+        document = MagicMock(spec=TextDocument)
+        document.source = (
+            '{\r\n  "expectedArtifacts": {\r\n    "contains": [\r\n'
+            '      {"type": "class", "name": "DataModel"}\r\n    ]\r\n  }\r\n}\r\n'
+        )
+
+        params = HoverParams(
+            text_document=TextDocumentIdentifier(uri="file:///path/to/manifest.json"),
+            position=Position(line=3, character=35),
+        )
+
+        result = handler.get_hover(params=params, document=document)
+
+        assert isinstance(result, Hover)
+        assert isinstance(result.contents, MarkupContent)
+        assert "class DataModel" in result.contents.value
+
+    def test_get_word_at_position_boundaries(self) -> None:
+        """_get_word_at_position should return the identifier touching the cursor."""
+        handler = HoverHandler()
+        line = '  "name": "my_func", "n": 1abc\n'
+
+        assert handler._get_word_at_position(line, 3) == "name"
+        assert handler._get_word_at_position(line, 11) == "my_func"
+        assert handler._get_word_at_position(line, 18) == "my_func"
+        assert handler._get_word_at_position(line, 19) is None
+        assert handler._get_word_at_position(line, 26) is None
+        assert handler._get_word_at_position(line, 27) == "abc"
+
 
 class TestFormatArtifactHover:
     """Test format_artifact_hover function."""
@@ -5,7 +5,12 @@ as a subclass of pygls LanguageServer, and that the create_server factory
 function returns a correctly configured server instance with registered handlers.
 """
 
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
 from lsprotocol.types import (
+    INITIALIZED,
     TEXT_DOCUMENT_CODE_ACTION,
     TEXT_DOCUMENT_DEFINITION,
     TEXT_DOCUMENT_DID_CHANGE,
@@ -13,9 +18,18 @@ from lsprotocol.types import (
     TEXT_DOCUMENT_DID_OPEN,
     TEXT_DOCUMENT_HOVER,
     TEXT_DOCUMENT_REFERENCES,
+    WORKSPACE_DID_CHANGE_WATCHED_FILES,
+    ClientCapabilities,
+    DidChangeWatchedFilesClientCapabilities,
+    DidChangeWatchedFilesParams,
+    FileChangeType,
+    FileEvent,
+    InitializedParams,
+    WorkspaceClientCapabilities,
 )
 from pygls.lsp.server import LanguageServer
 
+from maid_lsp.capabilities.references import _WorkspaceFiles, _WorkspaceIndex
 from maid_lsp.server import MaidLanguageServer, _register_handlers, create_server
 
 
@@ -197,6 +211,99 @@ class TestHandlerRegistration:
             f"Available handlers: {list(handlers.keys())}"
         )
 
+    def test_did_change_watched_files_clears_manifest_caches(self, tmp_path: Path) -> None:
+        """A created manifest should empty the caches it makes stale."""
+        server = create_server()
+        handler = server.protocol.fm.features[WORKSPACE_DID_CHANGE_WATCHED_FILES]
+
+        definition_handler = server.definition_handler
+        definition_handler._resolve_source_path(tmp_path / "task.manifest.json", "module.py")
+        references_handler = server.references_handler
+        index = _WorkspaceIndex(tmp_path)
+        references_handler._workspace_index = index
+        references_handler._workspace_listing = ((), _WorkspaceFiles([], []))
+        runner = definition_handler.runner
+        runner._fingerprint_cache = (tmp_path, float("inf"), ())
+        assert definition_handler._source_path_cache
+
+        handler(
+            DidChangeWatchedFilesParams(
+                changes=[
+                    FileEvent(
+                        uri=f"file://{tmp_path}/task.manifest.json", type=FileChangeType.Created
+                    )
+                ]
+            )
+        )
+
+        assert not definition_handler._source_path_cache
+        assert references_handler._workspace_listing is None
+        assert runner._fingerprint_cache is None
+        # The directory index notices the new file by itself
+        assert references_handler._workspace_index is index
+
+    def test_did_change_watched_files_keeps_caches_on_source_save(self, tmp_path: Path) -> None:
+        """Saving a Python file should not drop any file system cache."""
+        server = create_server()
+        handler = server.protocol.fm.features[WORKSPACE_DID_CHANGE_WATCHED_FILES]
+
+        definition_handler = server.definition_handler
+        definition_handler._resolve_source_path(tmp_path / "task.manifest.json", "module.py")
+        references_handler = server.references_handler
+        index = _WorkspaceIndex(tmp_path)
+        listing = ((), _WorkspaceFiles([], []))
+        references_handler._workspace_index = index
+        references_handler._workspace_listing = listing
+        runner = definition_handler.runner
+        fingerprint_cache = (tmp_path, float("inf"), ())
+        runner._fingerprint_cache = fingerprint_cache
+
+        handler(
+            DidChangeWatchedFilesParams(
+                changes=[FileEvent(uri=f"file://{tmp_path}/module.py", type=FileChangeType.Changed)]
+            )
+        )
+
+        assert definition_handler._source_path_cache
+        assert references_handler._workspace_index is index
+        assert references_handler._workspace_listing is listing
+        assert runner._fingerprint_cache is fingerprint_cache
+
+    @pytest.mark.asyncio
+    async def test_initialized_registers_file_watchers(self) -> None:
+        """initialized should register watchers for manifests and Python sources."""
+        server = create_server()
+        handler = server.protocol.fm.features[INITIALIZED]
+        server.protocol.client_capabilities = ClientCapabilities(
+            workspace=WorkspaceClientCapabilities(
+                did_change_watched_files=DidChangeWatchedFilesClientCapabilities(
+                    dynamic_registration=True
+                )
+            )
+        )
+
+        with patch.object(server, "client_register_capability_async") as register:
+            await handler(InitializedParams())
+
+        registration = register.call_args.args[0].registrations[0]
+        assert registration.method == WORKSPACE_DID_CHANGE_WATCHED_FILES
+        assert [w.glob_pattern for w in registration.register_options.watchers] == [
+            "**/*.manifest.json",
+            "**/*.py",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_initialized_skips_watchers_without_dynamic_registration(self) -> None:
+        """initialized should not register watchers the client can't accept."""
+        server = create_server()
+        handler = server.protocol.fm.features[INITIALIZED]
+        server.protocol.client_capabilities = ClientCapabilities()
+
+        with patch.object(server, "client_register_capability_async") as register:
+            await handler(InitializedParams())
+
+        register.assert_not_called()
+
     def test_register_handlers_called(self) -> None:
         """_register_handlers should be callable to register LSP handlers."""
         server = MaidLanguageServer(name="test-server", version="0.0.1")
@@ -5,8 +5,12 @@ in Python source files.
 """
 
 import ast
+import copy
+import pickle
+from dataclasses import fields
 from pathlib import Path
-from tempfile import NamedTemporaryFile
+
+import pytest
 
 from maid_lsp.utils.ast_parser import (
     ArtifactLocation,
@@ -17,34 +21,30 @@ from maid_lsp.utils.ast_parser import (
     parse_file,
 )
 
+# Trees shared by the lookup tests, which only read them
+_FUNCTION_TREE = ast.parse("def my_function():\n    pass\n")
+_METHOD_TREE = ast.parse("class MyClass:\n    def my_method(self):\n        pass\n")
+
 
 class TestParseFile:
     """Test parse_file function."""
 
-    def test_parses_valid_python_file(self) -> None:
+    def test_parses_valid_python_file(self, tmp_path: Path) -> None:
         """parse_file should parse a valid Python file and return AST."""
-        with NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
-            f.write("def my_function():\n    pass\n")
-            file_path = Path(f.name)
-
-        try:
-            tree = parse_file(file_path)
-            assert tree is not None
-            assert isinstance(tree, ast.Module)
-        finally:
-            file_path.unlink()
-
-    def test_returns_none_for_invalid_syntax(self) -> None:
+        file_path = tmp_path / "module.py"
+        file_path.write_text("def my_function():\n    pass\n")
+
+        tree = parse_file(file_path)
+        assert tree is not None
+        assert isinstance(tree, ast.Module)
+
+    def test_returns_none_for_invalid_syntax(self, tmp_path: Path) -> None:
         """parse_file should return None for files with invalid syntax."""
-        with NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
-            f.write("def invalid syntax here\n")
-            file_path = Path(f.name)
+        file_path = tmp_path / "module.py"
+        file_path.write_text("def invalid syntax here\n")
 
-        try:
-            tree = parse_file(file_path)
-            assert tree is None
-        finally:
-            file_path.unlink()
+        tree = parse_file(file_path)
+        assert tree is None
 
     def test_returns_none_for_nonexistent_file(self) -> None:
         """parse_file should return None for nonexistent files."""
@@ -52,17 +52,48 @@ class TestParseFile:
         tree = parse_file(file_path)
         assert tree is None
 
+    def test_reuses_tree_until_file_changes(self, tmp_path: Path) -> None:
+        """parse_file should return the cached tree for an unchanged file."""
+        file_path = tmp_path / "module.py"
+        file_path.write_text("def first():\n    pass\n")
+
+        tree = parse_file(file_path)
+        assert tree is not None
+        assert parse_file(file_path) is tree
+
+        file_path.write_text("def second_function():\n    pass\n")
+        changed = parse_file(file_path)
+        assert changed is not tree
+        assert changed is not None
+        assert isinstance(changed.body[0], ast.FunctionDef)
+        assert changed.body[0].name == "second_function"
+
+    def test_shares_tree_between_identical_files(self, tmp_path: Path) -> None:
+        """parse_file should parse identical contents once, whatever the path."""
+        source = "class Shared:\n    value = 1\n"
+        first = tmp_path / "first.py"
+        second = tmp_path / "second.py"
+        first.write_text(source)
+        second.write_text(source)
+
+        tree = parse_file(first)
+        assert tree is not None
+        assert parse_file(second) is tree
+
+        # Rewriting the same contents changes the file version but not the tree
+        first.write_text(source + "\n")
+        first.write_text(source)
+        assert parse_file(first) is tree
+
 
 class TestFindFunctionDefinition:
     """Test find_function_definition function."""
 
     def test_finds_module_level_function(self) -> None:
         """find_function_definition should find a module-level function."""
-        source = "def my_function():\n    pass\n"
-        tree = ast.parse(source)
         file_path = Path("/test/file.py")
 
-        location = find_function_definition(tree, "my_function", None, file_path)
+        location = find_function_definition(_FUNCTION_TREE, "my_function", None, file_path)
 
         assert location is not None
         assert isinstance(location, ArtifactLocation)
@@ -72,23 +103,36 @@ class TestFindFunctionDefinition:
 
     def test_finds_class_method(self) -> None:
         """find_function_definition should find a class method."""
-        source = "class MyClass:\n    def my_method(self):\n        pass\n"
-        tree = ast.parse(source)
         file_path = Path("/test/file.py")
 
-        location = find_function_definition(tree, "my_method", "MyClass", file_path)
+        location = find_function_definition(_METHOD_TREE, "my_method", "MyClass", file_path)
 
         assert location is not None
         assert isinstance(location, ArtifactLocation)
         assert location.file_path == file_path.resolve()
 
+    def test_finds_method_of_the_requested_class(self) -> None:
+        """find_function_definition should skip same-named functions outside the class."""
+        source = (
+            "def run():\n    pass\n"
+            "class Other:\n    def run(self):\n        pass\n"
+            "class MyClass:\n    async def run(self):\n        pass\n"
+        )
+        tree = ast.parse(source)
+        file_path = Path("/test/file.py")
+
+        method = find_function_definition(tree, "run", "MyClass", file_path)
+        function = find_function_definition(tree, "run", None, file_path)
+
+        assert method is not None and method.line == 6
+        assert function is not None and function.line == 0
+        assert find_function_definition(tree, "run", "Missing", file_path) is None
+
     def test_returns_none_for_nonexistent_function(self) -> None:
         """find_function_definition should return None for nonexistent function."""
-        source = "def other_function():\n    pass\n"
-        tree = ast.parse(source)
         file_path = Path("/test/file.py")
 
-        location = find_function_definition(tree, "my_function", None, file_path)
+        location = find_function_definition(_FUNCTION_TREE, "other_function", None, file_path)
 
         assert location is None
 
@@ -109,11 +153,9 @@ class TestFindClassDefinition:
 
     def test_finds_class_definition(self) -> None:
         """find_class_definition should find a class definition."""
-        source = "class MyClass:\n    pass\n"
-        tree = ast.parse(source)
         file_path = Path("/test/file.py")
 
-        location = find_class_definition(tree, "MyClass", file_path)
+        location = find_class_definition(_METHOD_TREE, "MyClass", file_path)
 
         assert location is not None
         assert isinstance(location, ArtifactLocation)
@@ -123,11 +165,9 @@ class TestFindClassDefinition:
 
     def test_returns_none_for_nonexistent_class(self) -> None:
         """find_class_definition should return None for nonexistent class."""
-        source = "class OtherClass:\n    pass\n"
-        tree = ast.parse(source)
         file_path = Path("/test/file.py")
 
-        location = find_class_definition(tree, "MyClass", file_path)
+        location = find_class_definition(_METHOD_TREE, "OtherClass", file_path)
 
         assert location is None
 
@@ -158,6 +198,35 @@ class TestFindAttributeDefinition:
         assert location is not None
         assert isinstance(location, ArtifactLocation)
 
+    def test_prefers_shallowest_definition(self) -> None:
+        """find_attribute_definition should return the first match in walk order."""
+        source = "def setup():\n    my_var = 0\na, b = 1, 2\nmy_var = 42\n"
+        tree = ast.parse(source)
+        file_path = Path("/test/file.py")
+
+        location = find_attribute_definition(tree, "my_var", file_path)
+
+        assert location is not None
+        assert location.line == 3
+        assert find_attribute_definition(tree, "a", file_path) is None
+
+    def test_finds_attributes_in_compound_statements(self) -> None:
+        """find_attribute_definition should look inside except handlers and match cases."""
+        source = (
+            "try:\n    import fast\nexcept ImportError:\n    fallback = None\n"
+            "match mode:\n    case 1:\n        chosen: int = 1\n"
+            "values = [x for x in range(3)]\n"
+        )
+        tree = ast.parse(source)
+        file_path = Path("/test/file.py")
+
+        fallback = find_attribute_definition(tree, "fallback", file_path)
+        chosen = find_attribute_definition(tree, "chosen", file_path)
+
+        assert fallback is not None and fallback.line == 3
+        assert chosen is not None and chosen.line == 6
+        assert find_attribute_definition(tree, "x", file_path) is None
+
     def test_returns_none_for_nonexistent_attribute(self) -> None:
         """find_attribute_definition should return None for nonexistent attribute."""
         source = "other_var = 42\n"
@@ -169,64 +238,53 @@ class TestFindAttributeDefinition:
         assert location is None
 
 
+@pytest.fixture(scope="module")
+def source_file(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Write one module holding every artifact kind, shared by the tests."""
+    file_path = tmp_path_factory.mktemp("artifacts") / "module.py"
+    file_path.write_text(
+        "__version__ = '1.0.0'\n"
+        "def my_function():\n    pass\n"
+        "class MyClass:\n    def my_method(self):\n        pass\n"
+    )
+    return file_path
+
+
 class TestFindArtifactDefinition:
     """Test find_artifact_definition function."""
 
-    def test_finds_function_artifact(self) -> None:
+    def test_finds_function_artifact(self, source_file: Path) -> None:
         """find_artifact_definition should find a function artifact."""
-        with NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
-            f.write("def my_function():\n    pass\n")
-            file_path = Path(f.name)
-
-        try:
-            location = find_artifact_definition(file_path, "function", "my_function", None)
+        location = find_artifact_definition(source_file, "function", "my_function", None)
 
-            assert location is not None
-            assert isinstance(location, ArtifactLocation)
-        finally:
-            file_path.unlink()
+        assert location is not None
+        assert isinstance(location, ArtifactLocation)
+        assert location.file_path == source_file.resolve()
+        assert location.line == 1
 
-    def test_finds_class_artifact(self) -> None:
+    def test_finds_class_artifact(self, source_file: Path) -> None:
         """find_artifact_definition should find a class artifact."""
-        with NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
-            f.write("class MyClass:\n    pass\n")
-            file_path = Path(f.name)
-
-        try:
-            location = find_artifact_definition(file_path, "class", "MyClass", None)
+        location = find_artifact_definition(source_file, "class", "MyClass", None)
 
-            assert location is not None
-            assert isinstance(location, ArtifactLocation)
-        finally:
-            file_path.unlink()
+        assert location is not None
+        assert isinstance(location, ArtifactLocation)
+        assert location.line == 3
 
-    def test_finds_attribute_artifact(self) -> None:
+    def test_finds_attribute_artifact(self, source_file: Path) -> None:
         """find_artifact_definition should find an attribute artifact."""
-        with NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
-            f.write("__version__ = '1.0.0'\n")
-            file_path = Path(f.name)
+        location = find_artifact_definition(source_file, "attribute", "__version__", None)
 
-        try:
-            location = find_artifact_definition(file_path, "attribute", "__version__", None)
-
-            assert location is not None
-            assert isinstance(location, ArtifactLocation)
-        finally:
-            file_path.unlink()
+        assert location is not None
+        assert isinstance(location, ArtifactLocation)
+        assert location.line == 0
 
-    def test_finds_class_method(self) -> None:
+    def test_finds_class_method(self, source_file: Path) -> None:
         """find_artifact_definition should find a class method."""
-        with NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
-            f.write("class MyClass:\n    def my_method(self):\n        pass\n")
-            file_path = Path(f.name)
+        location = find_artifact_definition(source_file, "function", "my_method", "MyClass")
 
-        try:
-            location = find_artifact_definition(file_path, "function", "my_method", "MyClass")
-
-            assert location is not None
-            assert isinstance(location, ArtifactLocation)
-        finally:
-            file_path.unlink()
+        assert location is not None
+        assert isinstance(location, ArtifactLocation)
+        assert location.line == 4
 
     def test_returns_none_for_invalid_file(self) -> None:
         """find_artifact_definition should return None for invalid file."""
@@ -234,18 +292,11 @@ class TestFindArtifactDefinition:
         location = find_artifact_definition(file_path, "function", "my_function", None)
         assert location is None
 
-    def test_returns_none_for_unknown_type(self) -> None:
+    def test_returns_none_for_unknown_type(self, source_file: Path) -> None:
         """find_artifact_definition should return None for unknown artifact type."""
-        with NamedTemporaryFile(mode="w", suffix=".py", delete=False) as f:
-            f.write("def my_function():\n    pass\n")
-            file_path = Path(f.name)
+        location = find_artifact_definition(source_file, "unknown", "my_function", None)
 
-        try:
-            location = find_artifact_definition(file_path, "unknown", "my_function", None)
-
-            assert location is None
-        finally:
-            file_path.unlink()
+        assert location is None
 
 
 class TestArtifactLocation:
@@ -267,3 +318,22 @@ class TestArtifactLocation:
         assert location.column == 5
         assert location.end_line == 10
         assert location.end_column == 15
+
+    def test_equal_locations_hash_alike(self) -> None:
+        """ArtifactLocation should hash by value and compare by its fields."""
+        first = ArtifactLocation(Path("/test/file.py"), 1, 4, 1, 10)
+        second = ArtifactLocation(Path("/test/file.py"), 1, 4, 1, 10)
+
+        assert first == second
+        assert hash(first) == hash(second)
+        assert len({first, second, ArtifactLocation(Path("/test/file.py"), 2, 4, 2, 10)}) == 2
+        assert [f.name for f in fields(first)] == [
+            "file_path",
+            "line",
+            "column",
+            "end_line",
+            "end_column",
+        ]
+        assert "_hash" not in repr(first)
+        assert copy.deepcopy(first) == first
+        assert hash(pickle.loads(pickle.dumps(first))) == hash(first)
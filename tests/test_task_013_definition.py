@@ -5,16 +5,18 @@ go-to-definition requests for bidirectional navigation between manifests
 and source files.
 """
 
+import asyncio
 import json
+import os
 from pathlib import Path
-from tempfile import NamedTemporaryFile
-from unittest.mock import AsyncMock, MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from lsprotocol.types import DefinitionParams, Position, TextDocumentIdentifier
 from pygls.workspace import TextDocument
 
 from maid_lsp.capabilities.definition import DefinitionHandler
+from maid_lsp.utils.ast_parser import find_artifact_definition
 from maid_lsp.validation.runner import MaidRunner
 
 
@@ -66,14 +68,12 @@ class TestDefinitionHandlerInit:
 class TestDefinitionHandlerGetDefinitionFromManifest:
     """Test DefinitionHandler.get_definition for manifest files."""
 
-    def test_returns_location_for_function_in_source(self) -> None:
+    def test_returns_location_for_function_in_source(self, tmp_path: Path) -> None:
         """get_definition should return location when clicking function in manifest."""
         handler = DefinitionHandler()
 
-        # Create a temporary source file
-        with NamedTemporaryFile(mode="w", suffix=".py", delete=False) as source_file:
-            source_file.write("def my_function():\n    pass\n")
-            source_path = Path(source_file.name)
+        source_path = tmp_path / "module.py"
+        source_path.write_text("def my_function():\n    pass\n")
 
         # Create a temporary manifest file
         manifest_content = {
@@ -84,41 +84,100 @@ class TestDefinitionHandlerGetDefinitionFromManifest:
             },
         }
 
-        with NamedTemporaryFile(mode="w", suffix=".manifest.json", delete=False) as manifest_file:
-            json.dump(manifest_content, manifest_file)
-            manifest_path = Path(manifest_file.name)
-
-        try:
-            document = MagicMock(spec=TextDocument)
-            manifest_json = json.dumps(manifest_content, indent=2)
-            document.source = manifest_json
-            document.lines = manifest_json.split("\n")
-
-            # Find the line with "my_function" in the JSON
-            line_num = None
-            for i, line in enumerate(document.lines):
-                if '"my_function"' in line:
-                    line_num = i
-                    char_pos = line.find('"my_function"') + 1  # Position inside the quotes
-                    break
-
-            assert line_num is not None, "Could not find my_function in manifest JSON"
-
-            params = DefinitionParams(
-                text_document=TextDocumentIdentifier(uri=f"file://{manifest_path}"),
-                position=Position(line=line_num, character=char_pos),
-            )
+        # One serialization backs both the file on disk and the open document
+        manifest_json = json.dumps(manifest_content, indent=2)
+        manifest_path = tmp_path / "task-001.manifest.json"
+        manifest_path.write_text(manifest_json)
+
+        document = MagicMock(spec=TextDocument)
+        document.source = manifest_json
+        document.lines = manifest_json.split("\n")
+
+        # Find the line with "my_function" in the JSON
+        line_num = None
+        for i, line in enumerate(document.lines):
+            if '"my_function"' in line:
+                line_num = i
+                char_pos = line.find('"my_function"') + 1  # Position inside the quotes
+                break
+
+        assert line_num is not None, "Could not find my_function in manifest JSON"
+
+        params = DefinitionParams(
+            text_document=TextDocumentIdentifier(uri=f"file://{manifest_path}"),
+            position=Position(line=line_num, character=char_pos),
+        )
+
+        result = handler.get_definition(params, document)
+
+        assert result is not None
+        assert result.uri == f"file://{source_path.resolve()}"
+        assert result.range.start.line == 0
 
-            result = handler._get_definition_from_manifest(params, document, manifest_path)
+    async def test_async_lookup_caches_source_definition(self, tmp_path: Path) -> None:
+        """The async manifest lookup should reuse the parsed source definition."""
+        handler = DefinitionHandler()
+        source_path = tmp_path / "module.py"
+        source_path.write_text("def my_function():\n    pass\n")
+        manifest_json = json.dumps(
+            {
+                "expectedArtifacts": {
+                    "file": str(source_path),
+                    "contains": [{"type": "function", "name": "my_function"}],
+                },
+            }
+        )
+        manifest_path = tmp_path / "task-001.manifest.json"
+
+        document = MagicMock(spec=TextDocument)
+        document.source = manifest_json
+        document.lines = [manifest_json]
+        params = DefinitionParams(
+            text_document=TextDocumentIdentifier(uri=f"file://{manifest_path}"),
+            position=Position(line=0, character=manifest_json.index("my_function")),
+        )
+
+        with patch(
+            "maid_lsp.capabilities.definition.find_artifact_definition",
+            wraps=find_artifact_definition,
+        ) as mock_find:
+            first = await handler.get_definition_async(params, document)
+            second = await handler.get_definition_async(params, document)
+
+        assert first is not None
+        assert first == second
+        assert first.uri == f"file://{source_path}"
+        mock_find.assert_called_once()
+
+    @pytest.mark.parametrize(
+        "artifact",
+        [
+            {"type": "method", "name": "my_function", "class": ["X"]},
+            {"type": ["function"], "name": "my_function"},
+            {"type": {"kind": "function"}, "name": "my_function"},
+        ],
+    )
+    def test_returns_none_for_malformed_artifact(self, tmp_path: Path, artifact: dict) -> None:
+        """get_definition should return None for artifacts with non-string fields."""
+        handler = DefinitionHandler()
+        source_path = tmp_path / "module.py"
+        source_path.write_text("def my_function():\n    pass\n")
+        manifest_json = json.dumps(
+            {"expectedArtifacts": {"file": str(source_path), "contains": [artifact]}}
+        )
+        manifest_path = tmp_path / "task-001.manifest.json"
+
+        document = MagicMock(spec=TextDocument)
+        document.source = manifest_json
+        document.lines = [manifest_json]
+        params = DefinitionParams(
+            text_document=TextDocumentIdentifier(uri=f"file://{manifest_path}"),
+            position=Position(line=0, character=manifest_json.index("my_function")),
+        )
 
-            assert result is not None
-            assert result.uri == f"file://{source_path.resolve()}"
-            assert result.range.start.line == 0
-        finally:
-            source_path.unlink()
-            manifest_path.unlink()
+        assert handler.get_definition(params, document) is None
 
-    def test_returns_none_when_artifact_not_found(self) -> None:
+    def test_returns_none_when_artifact_not_found(self, tmp_path: Path) -> None:
         """get_definition should return None when artifact not in manifest."""
         handler = DefinitionHandler()
 
@@ -130,27 +189,43 @@ class TestDefinitionHandlerGetDefinitionFromManifest:
             },
         }
 
-        with NamedTemporaryFile(mode="w", suffix=".manifest.json", delete=False) as manifest_file:
-            json.dump(manifest_content, manifest_file)
-            manifest_path = Path(manifest_file.name)
+        manifest_json = json.dumps(manifest_content)
+        manifest_path = tmp_path / "task-001.manifest.json"
+        manifest_path.write_text(manifest_json)
 
-        try:
-            document = MagicMock(spec=TextDocument)
-            document.source = json.dumps(manifest_content)
-            document.lines = document.source.split("\n")
+        document = MagicMock(spec=TextDocument)
+        document.source = manifest_json
+        document.lines = document.source.split("\n")
 
-            params = DefinitionParams(
-                text_document=TextDocumentIdentifier(uri=f"file://{manifest_path}"),
-                position=Position(line=0, character=0),  # Position not on artifact
-            )
+        params = DefinitionParams(
+            text_document=TextDocumentIdentifier(uri=f"file://{manifest_path}"),
+            position=Position(line=0, character=0),  # Position not on artifact
+        )
+
+        result = handler.get_definition(params, document)
+
+        assert result is None
+
+    def test_skips_parse_when_word_is_not_a_json_string(self) -> None:
+        """Words that only appear inside prose should not trigger a manifest parse."""
+        handler = DefinitionHandler()
+
+        document = MagicMock(spec=TextDocument)
+        document.source = '{"goal": "Add helper function", "expectedArtifacts": {}}'
+        document.lines = [document.source]
+
+        params = DefinitionParams(
+            text_document=TextDocumentIdentifier(uri="file:///project/manifests/t.manifest.json"),
+            position=Position(line=0, character=16),  # on "helper"
+        )
 
-            result = handler._get_definition_from_manifest(params, document, manifest_path)
+        with patch("maid_lsp.capabilities.definition.fast_json.loads") as mock_loads:
+            result = handler.get_definition(params, document)
 
-            assert result is None
-        finally:
-            manifest_path.unlink()
+        assert result is None
+        mock_loads.assert_not_called()
 
-    def test_handles_missing_source_file(self) -> None:
+    def test_handles_missing_source_file(self, tmp_path: Path) -> None:
         """get_definition should return None when source file doesn't exist."""
         handler = DefinitionHandler()
 
@@ -162,39 +237,34 @@ class TestDefinitionHandlerGetDefinitionFromManifest:
             },
         }
 
-        with NamedTemporaryFile(mode="w", suffix=".manifest.json", delete=False) as manifest_file:
-            json.dump(manifest_content, manifest_file)
-            manifest_path = Path(manifest_file.name)
+        manifest_json = json.dumps(manifest_content)
+        manifest_path = tmp_path / "task-001.manifest.json"
+        manifest_path.write_text(manifest_json)
 
-        try:
-            document = MagicMock(spec=TextDocument)
-            document.source = json.dumps(manifest_content)
-            document.lines = document.source.split("\n")
+        document = MagicMock(spec=TextDocument)
+        document.source = manifest_json
+        document.lines = document.source.split("\n")
 
-            params = DefinitionParams(
-                text_document=TextDocumentIdentifier(uri=f"file://{manifest_path}"),
-                position=Position(line=3, character=25),
-            )
+        params = DefinitionParams(
+            text_document=TextDocumentIdentifier(uri=f"file://{manifest_path}"),
+            position=Position(line=3, character=25),
+        )
 
-            result = handler._get_definition_from_manifest(params, document, manifest_path)
+        result = handler.get_definition(params, document)
 
-            assert result is None
-        finally:
-            manifest_path.unlink()
+        assert result is None
 
 
 class TestDefinitionHandlerGetDefinitionFromSource:
     """Test DefinitionHandler.get_definition for source files."""
 
     @pytest.mark.asyncio
-    async def test_returns_location_for_manifest_definition(self) -> None:
+    async def test_returns_location_for_manifest_definition(self, tmp_path: Path) -> None:
         """get_definition_async should return location when clicking artifact in source."""
         handler = DefinitionHandler()
 
-        # Create a temporary source file
-        with NamedTemporaryFile(mode="w", suffix=".py", delete=False) as source_file:
-            source_file.write("def my_function():\n    pass\n")
-            source_path = Path(source_file.name)
+        source_path = tmp_path / "module.py"
+        source_path.write_text("def my_function():\n    pass\n")
 
         # Create a temporary manifest file
         manifest_content = {
@@ -205,89 +275,198 @@ class TestDefinitionHandlerGetDefinitionFromSource:
             },
         }
 
-        with NamedTemporaryFile(mode="w", suffix=".manifest.json", delete=False) as manifest_file:
-            json.dump(manifest_content, manifest_file)
-            manifest_path = Path(manifest_file.name)
+        manifest_path = tmp_path / "task-001.manifest.json"
+        manifest_path.write_text(json.dumps(manifest_content))
 
-        try:
-            # Mock find_manifests to return our manifest
-            handler.runner.find_manifests = AsyncMock(return_value=[manifest_path])
+        # Mock find_manifests to return our manifest
+        handler.runner.find_manifests = AsyncMock(return_value=[manifest_path])
 
-            document = MagicMock(spec=TextDocument)
-            document.source = "def my_function():\n    pass\n"
-            document.lines = document.source.split("\n")
+        document = MagicMock(spec=TextDocument)
+        document.source = "def my_function():\n    pass\n"
+        document.lines = document.source.split("\n")
 
-            params = DefinitionParams(
-                text_document=TextDocumentIdentifier(uri=f"file://{source_path}"),
-                position=Position(line=0, character=4),  # Position on "my_function"
-            )
+        params = DefinitionParams(
+            text_document=TextDocumentIdentifier(uri=f"file://{source_path}"),
+            position=Position(line=0, character=4),  # Position on "my_function"
+        )
+
+        result = await handler.get_definition_async(params, document)
+
+        # The result might be None if the manifest doesn't contain the artifact
+        # or if the artifact location search fails, which is acceptable behavior
+        if result is not None:
+            assert isinstance(result, list) or hasattr(result, "uri")
+
+    @pytest.mark.asyncio
+    async def test_skips_manifest_lookup_when_not_on_a_word(self) -> None:
+        """get_definition_async should not search manifests for punctuation clicks."""
+        handler = DefinitionHandler()
+        handler.runner.find_manifests = AsyncMock(return_value=[])
+
+        document = MagicMock(spec=TextDocument)
+        document.source = "x = (1, 2)\n"
 
-            result = await handler.get_definition_async(params, document)
+        params = DefinitionParams(
+            text_document=TextDocumentIdentifier(uri="file:///project/src/module.py"),
+            position=Position(line=0, character=4),  # on "("
+        )
 
-            # The result might be None if the manifest doesn't contain the artifact
-            # or if the artifact location search fails, which is acceptable behavior
-            if result is not None:
-                assert isinstance(result, list) or hasattr(result, "uri")
-        finally:
-            source_path.unlink()
-            manifest_path.unlink()
+        result = await handler.get_definition_async(params, document)
+
+        assert result is None
+        handler.runner.find_manifests.assert_not_called()
 
     @pytest.mark.asyncio
-    async def test_returns_none_when_no_manifests_found(self) -> None:
+    async def test_returns_none_when_no_manifests_found(self, tmp_path: Path) -> None:
         """get_definition_async should return None when no manifests found."""
         handler = DefinitionHandler()
 
-        with NamedTemporaryFile(mode="w", suffix=".py", delete=False) as source_file:
-            source_file.write("def my_function():\n    pass\n")
-            source_path = Path(source_file.name)
+        source_path = tmp_path / "module.py"
+        source_path.write_text("def my_function():\n    pass\n")
+
+        # Mock find_manifests to return empty list
+        handler.runner.find_manifests = AsyncMock(return_value=[])
 
-        try:
-            # Mock find_manifests to return empty list
-            handler.runner.find_manifests = AsyncMock(return_value=[])
+        document = MagicMock(spec=TextDocument)
+        document.source = "def my_function():\n    pass\n"
+        document.lines = document.source.split("\n")
+
+        params = DefinitionParams(
+            text_document=TextDocumentIdentifier(uri=f"file://{source_path}"),
+            position=Position(line=0, character=4),
+        )
+
+        result = await handler.get_definition_async(params, document)
+
+        assert result is None
+
+    @pytest.mark.asyncio
+    async def test_returns_first_manifest_defining_artifact(self, tmp_path: Path) -> None:
+        """get_definition_async should prefer the earliest manifest that defines the artifact."""
+        handler = DefinitionHandler()
+
+        source_path = tmp_path / "module.py"
+        source_path.write_text("def my_function():\n    pass\n")
+
+        manifest_paths = []
+        for index, names in enumerate([["other"], ["my_function"], ["my_function"]]):
+            manifest_path = tmp_path / f"task-00{index}.manifest.json"
+            manifest_content = {
+                "goal": "Test",
+                "expectedArtifacts": {
+                    "file": str(source_path),
+                    "contains": [{"type": "function", "name": name} for name in names],
+                },
+            }
+            manifest_path.write_text(json.dumps(manifest_content, indent=2))
+            manifest_paths.append(manifest_path)
+
+        handler.runner.find_manifests = AsyncMock(return_value=manifest_paths)
+
+        document = MagicMock(spec=TextDocument)
+        document.source = source_path.read_text()
+        document.lines = document.source.split("\n")
+
+        params = DefinitionParams(
+            text_document=TextDocumentIdentifier(uri=f"file://{source_path}"),
+            position=Position(line=0, character=4),
+        )
+
+        result = await handler.get_definition_async(params, document)
+
+        assert result is not None
+        assert not isinstance(result, list)
+        assert result.uri == handler._path_to_uri(manifest_paths[1])
+
+    @pytest.mark.asyncio
+    async def test_newer_request_supersedes_pending_one(self, tmp_path: Path) -> None:
+        """get_definition_async should only search for the last of rapid requests."""
+        handler = DefinitionHandler()
+        handler.runner.find_manifests = AsyncMock(return_value=[])
 
-            document = MagicMock(spec=TextDocument)
-            document.source = "def my_function():\n    pass\n"
-            document.lines = document.source.split("\n")
+        source_path = tmp_path / "module.py"
+        document = MagicMock(spec=TextDocument)
+        document.source = "def my_function():\n    other_function()\n"
 
-            params = DefinitionParams(
+        first, second = (
+            DefinitionParams(
                 text_document=TextDocumentIdentifier(uri=f"file://{source_path}"),
-                position=Position(line=0, character=4),
+                position=Position(line=line, character=4),
             )
+            for line in (0, 1)
+        )
+
+        results = await asyncio.gather(
+            handler.get_definition_async(first, document),
+            handler.get_definition_async(second, document),
+        )
+
+        assert results == [None, None]
+        handler.runner.find_manifests.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_single_manifest_loads_off_event_loop(self, tmp_path: Path) -> None:
+        """An uncached manifest should be read on a worker thread, a cached one inline."""
+        manifest = {
+            "goal": "Test",
+            "expectedArtifacts": {
+                "file": "src/module.py",
+                "contains": [{"type": "function", "name": "my_function"}],
+            },
+        }
+        manifest_path = tmp_path / "task-001.manifest.json"
+        manifest_path.write_text(json.dumps(manifest, indent=2))
+
+        handler = DefinitionHandler()
+        handler.runner.find_manifests = AsyncMock(return_value=[manifest_path])
+        source_path = tmp_path / "module.py"
 
-            result = await handler.get_definition_async(params, document)
+        with patch(
+            "maid_lsp.capabilities.definition.asyncio.to_thread", wraps=asyncio.to_thread
+        ) as to_thread:
+            first = await handler._get_definition_from_source_async("my_function", source_path)
+            assert to_thread.call_count == 1
 
-            assert result is None
-        finally:
-            source_path.unlink()
+            second = await handler._get_definition_from_source_async("my_function", source_path)
+            assert to_thread.call_count == 1
+
+        assert first is not None
+        assert second == first
 
 
 class TestDefinitionHandlerPathResolution:
     """Test DefinitionHandler path resolution methods."""
 
-    def test_resolves_relative_source_path(self) -> None:
+    def test_resolves_relative_source_path(self, tmp_path: Path) -> None:
         """_resolve_source_path should resolve relative paths correctly."""
         handler = DefinitionHandler()
 
-        # Create temporary directory structure
-        with NamedTemporaryFile(
-            mode="w", suffix=".manifest.json", delete=False, dir="/tmp"
-        ) as manifest_file:
-            manifest_path = Path(manifest_file.name)
+        manifest_path = tmp_path / "task-001.manifest.json"
+        manifest_path.write_text("{}")
 
         # Create source file relative to manifest
-        source_path = manifest_path.parent / "src" / "module.py"
-        source_path.parent.mkdir(parents=True, exist_ok=True)
+        source_path = tmp_path / "src" / "module.py"
+        source_path.parent.mkdir()
+        source_path.write_text("def test():\n    pass\n")
+
+        resolved = handler._resolve_source_path(manifest_path, "src/module.py")
+        assert resolved is not None
+        assert resolved.exists()
+
+    def test_caches_source_path_until_cleared(self, tmp_path: Path) -> None:
+        """Resolved source paths should be cached until clear_path_cache is called."""
+        handler = DefinitionHandler()
+        manifest_path = tmp_path / "manifests" / "task-001.manifest.json"
+        source_path = tmp_path / "src" / "module.py"
+
+        assert handler._resolve_source_path(manifest_path, "src/module.py") is None
+
+        source_path.parent.mkdir()
         source_path.write_text("def test():\n    pass\n")
+        assert handler._resolve_source_path(manifest_path, "src/module.py") is None
 
-        try:
-            resolved = handler._resolve_source_path(manifest_path, "src/module.py")
-            assert resolved is not None
-            assert resolved.exists()
-        finally:
-            if source_path.exists():
-                source_path.unlink()
-            if manifest_path.exists():
-                manifest_path.unlink()
+        handler.clear_path_cache()
+        assert handler._resolve_source_path(manifest_path, "src/module.py") == source_path
 
     def test_finds_project_root(self) -> None:
         """_find_project_root should find project root correctly."""
@@ -324,6 +503,40 @@ class TestDefinitionHandlerUtilityMethods:
 
         assert word == "my_function"
 
+    def test_get_word_at_position_boundaries(self) -> None:
+        """_get_word_at_position should match identifiers at and around the cursor."""
+        handler = DefinitionHandler()
+
+        document = MagicMock(spec=TextDocument)
+        document.source = 'x = obj.attr_1 + 42abc + "name"'
+        document.lines = [document.source]
+
+        def word_at(character: int) -> str | None:
+            return handler._get_word_at_position(document, Position(line=0, character=character))
+
+        assert word_at(0) == "x"
+        assert word_at(1) == "x"
+        assert word_at(2) is None
+        assert word_at(8) == "attr_1"
+        assert word_at(14) == "attr_1"
+        assert word_at(17) is None
+        assert word_at(19) == "abc"
+        assert word_at(27) == "name"
+
+    def test_get_word_at_position_on_later_lines(self) -> None:
+        """_get_word_at_position should handle CRLF endings and out-of-range lines."""
+        handler = DefinitionHandler()
+
+        document = MagicMock(spec=TextDocument)
+        document.source = "first\r\nsecond_word\r\nthird"
+
+        assert handler._get_word_at_position(document, Position(line=1, character=11)) == (
+            "second_word"
+        )
+        assert handler._get_word_at_position(document, Position(line=1, character=12)) is None
+        assert handler._get_word_at_position(document, Position(line=2, character=0)) == "third"
+        assert handler._get_word_at_position(document, Position(line=3, character=0)) is None
+
     def test_find_artifact_by_name(self) -> None:
         """_find_artifact_by_name should find artifact in manifest."""
         handler = DefinitionHandler()
@@ -347,6 +560,9 @@ class TestDefinitionHandlerUtilityMethods:
         assert handler._is_manifest_file(Path("task-001.manifest.json")) is True
         assert handler._is_manifest_file(Path("manifests/task.json")) is True
         assert handler._is_manifest_file(Path("src/module.py")) is False
+        assert handler._is_manifest_file(Path("/project/manifests/task.json")) is True
+        assert handler._is_manifest_file(Path("/project/manifests_old/task.json")) is False
+        assert handler._is_manifest_file(Path("/project/manifests/notes.txt")) is False
 
     def test_uri_to_path(self) -> None:
         """_uri_to_path should convert URI to Path correctly."""
@@ -354,6 +570,14 @@ class TestDefinitionHandlerUtilityMethods:
 
         path = handler._uri_to_path("file:///path/to/file.py")
         assert isinstance(path, Path)
+        assert path == Path("/path/to/file.py")
+
+    def test_uri_to_path_with_host_and_fragment(self) -> None:
+        """_uri_to_path should fall back to URL parsing for non-trivial URIs."""
+        handler = DefinitionHandler()
+
+        assert handler._uri_to_path("file://localhost/path/file.py") == Path("/path/file.py")
+        assert handler._uri_to_path("file:///path/file.py#L1") == Path("/path/file.py")
 
     def test_path_to_uri(self) -> None:
         """_path_to_uri should convert Path to URI correctly."""
@@ -361,3 +585,159 @@ class TestDefinitionHandlerUtilityMethods:
 
         uri = handler._path_to_uri(Path("/path/to/file.py"))
         assert uri.startswith("file://")
+        assert uri == "file:///path/to/file.py"
+
+    def test_path_to_uri_quotes_reserved_characters(self) -> None:
+        """_path_to_uri should percent-encode reserved characters in the path."""
+        handler = DefinitionHandler()
+
+        uri = handler._path_to_uri(Path("/path/my project/file#1.py"))
+        assert uri == "file:///path/my%20project/file%231.py"
+
+    def test_path_to_uri_round_trips(self) -> None:
+        """_uri_to_path should decode every path _path_to_uri encodes."""
+        handler = DefinitionHandler()
+
+        for path in (
+            Path("/path/my project/file#1.py"),
+            Path("/path/café/módulo.py"),
+            Path("/path/100%/file?.py"),
+        ):
+            uri = handler._path_to_uri(path)
+            assert uri.isascii()
+            assert handler._uri_to_path(uri) == path
+
+
+class TestDefinitionHandlerManifestCache:
+    """Test DefinitionHandler manifest caching."""
+
+    def test_reuses_parsed_manifest_when_unchanged(self, tmp_path: Path) -> None:
+        """_load_manifest should return the cached entry for an unchanged file."""
+        handler = DefinitionHandler()
+        manifest_path = tmp_path / "task-001.manifest.json"
+        manifest_path.write_text(json.dumps({"goal": "Test"}))
+
+        first = handler._load_manifest(manifest_path)
+        second = handler._load_manifest(manifest_path)
+
+        assert first is not None
+        assert second is first
+
+    def test_reloads_manifest_when_modified(self, tmp_path: Path) -> None:
+        """_load_manifest should re-read a manifest whose mtime changed."""
+        handler = DefinitionHandler()
+        manifest_path = tmp_path / "task-001.manifest.json"
+        manifest_path.write_text(
+            json.dumps({"expectedArtifacts": {"contains": [{"name": "old_function"}]}})
+        )
+
+        first = handler._load_manifest(manifest_path)
+        assert first is not None
+        assert "old_function" in first.name_index
+
+        manifest_path.write_text(
+            json.dumps({"expectedArtifacts": {"contains": [{"name": "new_function"}]}})
+        )
+        stat = manifest_path.stat()
+        os.utime(manifest_path, ns=(stat.st_atime_ns, first.mtime_ns + 1_000_000))
+
+        second = handler._load_manifest(manifest_path)
+        assert second is not None
+        assert "new_function" in second.name_index
+        assert "old_function" not in second.name_index
+
+    def test_returns_none_for_invalid_manifest(self, tmp_path: Path) -> None:
+        """_load_manifest should return None for unreadable or invalid JSON."""
+        handler = DefinitionHandler()
+        manifest_path = tmp_path / "task-001.manifest.json"
+        manifest_path.write_text("{not json")
+
+        assert handler._load_manifest(manifest_path) is None
+        assert handler._load_manifest(tmp_path / "missing.manifest.json") is None
+
+    def test_finds_artifact_location_from_name_index(self, tmp_path: Path) -> None:
+        """_scan_manifest_sync should locate the artifact's name field."""
+        handler = DefinitionHandler()
+        manifest = {
+            "goal": "Test",
+            "expectedArtifacts": {
+                "file": "src/module.py",
+                "contains": [
+                    {"type": "function", "name": "helper", "args": [{"name": "value"}]},
+                    {"type": "function", "name": "my_function"},
+                ],
+            },
+        }
+        manifest_json = json.dumps(manifest, indent=2)
+        manifest_path = tmp_path / "task-001.manifest.json"
+        manifest_path.write_text(manifest_json)
+
+        result = handler._scan_manifest_sync(manifest_path, "my_function")
+
+        lines = manifest_json.split("\n")
+        expected_line = next(i for i, line in enumerate(lines) if '"my_function"' in line)
+        expected_column = lines[expected_line].index('"my_function"')
+        assert result is not None
+        assert result.range.start.line == expected_line
+        assert result.range.start.character == expected_column
+        assert result.range.end.character == expected_column + len('"my_function"')
+
+        # Argument names are "name" fields but not artifacts
+        assert handler._scan_manifest_sync(manifest_path, "value") is None
+
+    def test_name_index_ignores_nested_name_fields(self, tmp_path: Path) -> None:
+        """Argument names should not shadow an artifact with the same name."""
+        handler = DefinitionHandler()
+        manifest = {
+            "expectedArtifacts": {
+                "contains": [
+                    {"type": "function", "name": "run", "args": [{"name": "process"}]},
+                    {"type": "function", "name": "process"},
+                ],
+            },
+        }
+        manifest_json = json.dumps(manifest, indent=2)
+        manifest_path = tmp_path / "task-001.manifest.json"
+        manifest_path.write_text(manifest_json)
+
+        result = handler._scan_manifest_sync(manifest_path, "process")
+
+        lines = manifest_json.split("\n")
+        expected_line = max(i for i, line in enumerate(lines) if '"process"' in line)
+        assert result is not None
+        assert result.range.start.line == expected_line
+
+    def test_name_index_columns_count_characters(self, tmp_path: Path) -> None:
+        """Columns should be character offsets even after non-ASCII text."""
+        handler = DefinitionHandler()
+        manifest_path = tmp_path / "task-001.manifest.json"
+        manifest_path.write_text(
+            '{"goal": "Café",\n "expectedArtifacts": {"contains": [\n'
+            '  {"description": "ünïcode", "name": "my_function"}]}}',
+            encoding="utf-8",
+        )
+
+        result = handler._scan_manifest_sync(manifest_path, "my_function")
+
+        line = '  {"description": "ünïcode", "name": "my_function"}]}}'
+        assert result is not None
+        assert result.range.start.line == 2
+        assert result.range.start.character == line.index('"my_function"')
+        assert result.range.end.character == line.index('"my_function"') + len('"my_function"')
+
+    def test_name_index_tracks_manifest_changes(self, tmp_path: Path) -> None:
+        """The artifact name lookup should follow changes to a manifest."""
+        handler = DefinitionHandler()
+        manifest_path = tmp_path / "task-001.manifest.json"
+
+        def write_manifest(names: list[str], mtime_ns: int) -> None:
+            manifest = {"expectedArtifacts": {"contains": [{"name": n} for n in names]}}
+            manifest_path.write_text(json.dumps(manifest, indent=2))
+            os.utime(manifest_path, ns=(mtime_ns, mtime_ns))
+
+        write_manifest(["old_name"], 1_000_000_000)
+        assert handler._scan_manifest_sync(manifest_path, "old_name") is not None
+
+        write_manifest(["new_name"], 2_000_000_000)
+        assert handler._scan_manifest_sync(manifest_path, "old_name") is None
+        assert handler._scan_manifest_sync(manifest_path, "new_name") is not None
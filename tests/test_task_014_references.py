@@ -4,16 +4,30 @@ These tests verify that the ReferencesHandler class correctly handles
 find-references requests to locate all places where artifacts are referenced.
 """
 
+import asyncio
 import json
+import os
 from pathlib import Path
-from tempfile import NamedTemporaryFile, TemporaryDirectory
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import pytest
-from lsprotocol.types import Position, ReferenceParams, TextDocumentIdentifier
+from lsprotocol.types import (
+    Location,
+    Position,
+    Range,
+    ReferenceParams,
+    TextDocumentIdentifier,
+)
 from pygls.workspace import TextDocument
 
-from maid_lsp.capabilities.references import ReferencesHandler
+from maid_lsp.capabilities import references as references_module
+from maid_lsp.capabilities.definition import DefinitionHandler
+from maid_lsp.capabilities.references import (
+    ReferencesHandler,
+    _definition_types_cached,
+    _reference_index_cached,
+    _WorkspaceIndex,
+)
 from maid_lsp.validation.runner import MaidRunner
 
 
@@ -66,134 +80,504 @@ class TestReferencesHandlerGetReferences:
         assert result == []
 
     @pytest.mark.asyncio
-    async def test_finds_references_in_manifests(self) -> None:
+    async def test_finds_references_in_manifests(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """get_references should find references in manifest files."""
         handler = ReferencesHandler()
 
-        with TemporaryDirectory() as tmpdir:
-            manifest_dir = Path(tmpdir) / "manifests"
-            manifest_dir.mkdir()
+        manifest_dir = tmp_path / "manifests"
+        manifest_dir.mkdir()
 
-            manifest_content = {
-                "goal": "Test",
-                "expectedArtifacts": {
-                    "file": "src/module.py",
-                    "contains": [{"type": "function", "name": "my_function"}],
-                },
-            }
+        manifest_content = {
+            "goal": "Test",
+            "expectedArtifacts": {
+                "file": "src/module.py",
+                "contains": [{"type": "function", "name": "my_function"}],
+            },
+        }
+
+        manifest_json = json.dumps(manifest_content)
+        manifest_path = manifest_dir / "task-001.manifest.json"
+        manifest_path.write_text(manifest_json)
+
+        document = MagicMock(spec=TextDocument)
+        document.source = manifest_json
+        document.lines = document.source.split("\n")
+
+        params = ReferenceParams(
+            text_document=TextDocumentIdentifier(uri=f"file://{manifest_path}"),
+            position=Position(line=5, character=25),  # Position on "my_function"
+            context=None,  # type: ignore[arg-type]
+        )
+
+        # Mock workspace root
+        monkeypatch.chdir(tmp_path)
+        result = await handler.get_references(params, document)
+        assert isinstance(result, list)
+
+    async def test_falls_back_to_manifests_declaring_the_artifact(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """get_references should use the manifests of a source file that only uses a name."""
+        manifest_path = tmp_path / "manifests" / "task-001.manifest.json"
+        manifest_path.parent.mkdir()
+        manifest_path.write_text(
+            json.dumps({"expectedArtifacts": {"contains": [{"type": "function", "name": "run"}]}})
+        )
+        source_path = tmp_path / "main.py"
+        source_path.write_text("run()\n")
+        monkeypatch.chdir(tmp_path)
+
+        runner = MagicMock(spec=MaidRunner)
+        runner.find_manifests.return_value = [tmp_path / "missing.manifest.json", manifest_path]
+        handler = ReferencesHandler(runner)
+
+        document = MagicMock(spec=TextDocument)
+        document.source = source_path.read_text()
+        params = ReferenceParams(
+            text_document=TextDocumentIdentifier(uri=f"file://{source_path}"),
+            position=Position(line=0, character=1),
+            context=None,  # type: ignore[arg-type]
+        )
+
+        result = await handler.get_references(params, document)
 
-            manifest_path = manifest_dir / "task-001.manifest.json"
-            with open(manifest_path, "w") as f:
-                json.dump(manifest_content, f)
+        assert result is not None
+        assert {location.uri for location in result} == {
+            f"file://{manifest_path}",
+            f"file://{source_path}",
+        }
 
-            document = MagicMock(spec=TextDocument)
-            document.source = json.dumps(manifest_content)
-            document.lines = document.source.split("\n")
+    @pytest.mark.asyncio
+    async def test_newer_request_supersedes_pending_one(self) -> None:
+        """get_references should only search for the last of rapid requests."""
+        handler = ReferencesHandler()
 
-            params = ReferenceParams(
-                text_document=TextDocumentIdentifier(uri=f"file://{manifest_path}"),
-                position=Position(line=5, character=25),  # Position on "my_function"
+        document = MagicMock(spec=TextDocument)
+        document.source = "def my_function():\n    other_function()\n"
+
+        first, second = (
+            ReferenceParams(
+                text_document=TextDocumentIdentifier(uri="file:///path/to/file.py"),
+                position=Position(line=line, character=4),
                 context=None,  # type: ignore[arg-type]
             )
+            for line in (0, 1)
+        )
+
+        with patch.object(
+            handler, "_get_artifact_info_from_source", return_value=None
+        ) as mock_info:
+            results = await asyncio.gather(
+                handler.get_references(first, document),
+                handler.get_references(second, document),
+            )
+
+        assert results[0] is None
+        assert results[1] == []
+        mock_info.assert_called_once_with(Path("/path/to/file.py"), "other_function")
+
+    @pytest.mark.asyncio
+    async def test_cancelled_request_propagates_cancellation(self) -> None:
+        """Cancelling a pending get_references task should not return a result."""
+        handler = ReferencesHandler()
+        document = MagicMock(spec=TextDocument)
+        document.source = "def my_function():\n    pass\n"
+        params = ReferenceParams(
+            text_document=TextDocumentIdentifier(uri="file:///path/to/file.py"),
+            position=Position(line=0, character=4),
+            context=None,  # type: ignore[arg-type]
+        )
 
-            # Mock workspace root
-            import os
+        task = asyncio.create_task(handler.get_references(params, document))
+        await asyncio.sleep(0)
+        task.cancel()
 
-            original_cwd = os.getcwd()
-            try:
-                os.chdir(tmpdir)
-                result = await handler.get_references(params, document)
-                assert isinstance(result, list)
-            finally:
-                os.chdir(original_cwd)
+        with pytest.raises(asyncio.CancelledError):
+            await task
 
 
 class TestReferencesHandlerFindInManifests:
     """Test ReferencesHandler._find_in_manifests method."""
 
     @pytest.mark.asyncio
-    async def test_finds_artifact_references_in_manifest(self) -> None:
+    async def test_finds_artifact_references_in_manifest(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """_find_in_manifests should find references in manifest files."""
         handler = ReferencesHandler()
 
-        with TemporaryDirectory() as tmpdir:
-            manifest_dir = Path(tmpdir) / "manifests"
-            manifest_dir.mkdir()
+        manifest_dir = tmp_path / "manifests"
+        manifest_dir.mkdir()
 
-            manifest_content = {
-                "goal": "Test",
-                "expectedArtifacts": {
-                    "file": "src/module.py",
-                    "contains": [{"type": "function", "name": "my_function"}],
-                },
-            }
+        manifest_content = {
+            "goal": "Test",
+            "expectedArtifacts": {
+                "file": "src/module.py",
+                "contains": [{"type": "function", "name": "my_function"}],
+            },
+        }
 
-            manifest_path = manifest_dir / "task-001.manifest.json"
-            with open(manifest_path, "w") as f:
-                json.dump(manifest_content, f)
+        manifest_path = manifest_dir / "task-001.manifest.json"
+        manifest_path.write_text(json.dumps(manifest_content))
 
-            artifact_info = {"type": "function", "name": "my_function"}
+        artifact_info = {"type": "function", "name": "my_function"}
 
-            import os
+        monkeypatch.chdir(tmp_path)
+        result = await handler._find_in_manifests("my_function", artifact_info)
+        assert isinstance(result, list)
 
-            original_cwd = os.getcwd()
-            try:
-                os.chdir(tmpdir)
-                result = await handler._find_in_manifests("my_function", artifact_info)
-                assert isinstance(result, list)
-            finally:
-                os.chdir(original_cwd)
+    def test_manifest_reference_positions(self, tmp_path: Path) -> None:
+        """_find_artifact_references_in_manifest should report strings equal to the name."""
+        handler = ReferencesHandler()
+        manifest_path = tmp_path / "task-001.manifest.json"
+        manifest_path.write_text(
+            '{\n  "contains": [{"name": "my_function"}],\n'
+            '  "notes": ["my_function_extra", "see \'my_function\'", "my_function"]\n}\n'
+        )
+
+        result = handler._find_artifact_references_in_manifest(manifest_path, "my_function")
+
+        positions = [
+            (ref.range.start.line, ref.range.start.character, ref.range.end.character)
+            for ref in result
+        ]
+        assert positions == [(1, 24, 37), (2, 54, 67)]
+
+    def test_manifest_references_follow_file_changes(self, tmp_path: Path) -> None:
+        """_find_artifact_references_in_manifest should re-index an edited manifest."""
+        handler = ReferencesHandler()
+        manifest_path = tmp_path / "task-001.manifest.json"
+        manifest_path.write_text('{"contains": [{"name": "first"}]}\n')
+        os.utime(manifest_path, ns=(1_000_000_000, 1_000_000_000))
+
+        assert len(handler._find_artifact_references_in_manifest(manifest_path, "first")) == 1
+        assert handler._find_artifact_references_in_manifest(manifest_path, "second") == []
+
+        manifest_path.write_text('{"contains": [{"name": "second"}, {"name": "second"}]}\n')
+        os.utime(manifest_path, ns=(2_000_000_000, 2_000_000_000))
+
+        assert handler._find_artifact_references_in_manifest(manifest_path, "first") == []
+        assert len(handler._find_artifact_references_in_manifest(manifest_path, "second")) == 2
 
 
 class TestReferencesHandlerFindInSource:
     """Test ReferencesHandler._find_in_source method."""
 
-    def test_finds_function_call_references(self) -> None:
+    def test_finds_function_call_references(self, tmp_path: Path) -> None:
         """_find_artifact_references_in_source should find function call references."""
         handler = ReferencesHandler()
 
-        with NamedTemporaryFile(mode="w", suffix=".py", delete=False) as source_file:
-            source_file.write("def my_function():\n    pass\n\nresult = my_function()\n")
-            source_path = Path(source_file.name)
+        source_path = tmp_path / "module.py"
+        source_path.write_text("def my_function():\n    pass\n\nresult = my_function()\n")
 
-        try:
-            artifact_info = {"type": "function", "name": "my_function"}
-            workspace_root = source_path.parent
+        artifact_info = {"type": "function", "name": "my_function"}
 
-            result = handler._find_artifact_references_in_source(
-                source_path, "my_function", artifact_info, workspace_root
-            )
+        result = handler._find_artifact_references_in_source(
+            source_path, "my_function", artifact_info, tmp_path
+        )
+
+        assert isinstance(result, list)
+        # Should find at least the call reference
+        assert len(result) > 0
+
+    def test_reports_each_call_reference_once(self, tmp_path: Path) -> None:
+        """Calls should be reported once, not as both a call and a name/attribute."""
+        handler = ReferencesHandler()
+        source_path = tmp_path / "module.py"
+        source_path.write_text(
+            "from module import my_function\nmy_function()\nobj.my_function(my_function)\n"
+        )
+
+        result = handler._find_artifact_references_in_source(
+            source_path, "my_function", {"type": "function"}, tmp_path
+        )
+
+        positions = sorted((ref.range.start.line, ref.range.start.character) for ref in result)
+        assert positions == [(0, 19), (1, 0), (2, 4), (2, 16)]
+
+    def test_attribute_reference_points_at_attribute_name(self, tmp_path: Path) -> None:
+        """Attribute references should cover the attribute, not the accessed value."""
+        handler = ReferencesHandler()
+        source_path = tmp_path / "module.py"
+        source_path.write_text("my_function.my_function\n(obj\n .my_function)\n")
 
-            assert isinstance(result, list)
-            # Should find at least the call reference
-            assert len(result) > 0
-        finally:
-            source_path.unlink()
+        result = handler._find_artifact_references_in_source(
+            source_path, "my_function", {"type": "function"}, tmp_path
+        )
 
-    def test_finds_import_references(self) -> None:
+        ranges = sorted(
+            (ref.range.start.line, ref.range.start.character, ref.range.end.character)
+            for ref in result
+        )
+        assert ranges == [(0, 0, 11), (0, 12, 23), (2, 2, 13)]
+
+    def test_reuses_reference_index_for_unchanged_file(self, tmp_path: Path) -> None:
+        """Queries for any name on an unchanged file should reuse one reference index."""
+        handler = ReferencesHandler()
+        source_path = tmp_path / "module.py"
+        source_path.write_text("my_function(other_function)\n")
+
+        first = handler._find_artifact_references_in_source(
+            source_path, "my_function", {"type": "function"}, tmp_path
+        )
+        hits = _reference_index_cached.cache_info().hits
+        other = handler._find_artifact_references_in_source(
+            source_path, "other_function", {"type": "function"}, tmp_path
+        )
+
+        assert [ref.range.start.character for ref in first] == [0]
+        assert [ref.range.start.character for ref in other] == [12]
+        assert _reference_index_cached.cache_info().hits == hits + 1
+
+    def test_finds_several_names_in_one_pass(self, tmp_path: Path) -> None:
+        """_find_names_in_source should group the references of each name."""
+        handler = ReferencesHandler()
+        source_path = tmp_path / "module.py"
+        source_path.write_text("import helper as alias\nfirst()\nalias.second(first)\n")
+
+        result = handler._find_names_in_source(
+            source_path, frozenset({"first", "second", "alias", "missing"})
+        )
+
+        positions = {
+            name: sorted((ref.range.start.line, ref.range.start.character) for ref in refs)
+            for name, refs in result.items()
+        }
+        assert positions == {
+            "alias": [(0, 7), (2, 0)],
+            "first": [(1, 0), (2, 13)],
+            "second": [(2, 6)],
+        }
+
+    def test_finds_import_references(self, tmp_path: Path) -> None:
         """_find_artifact_references_in_source should find import references."""
         handler = ReferencesHandler()
 
-        with NamedTemporaryFile(mode="w", suffix=".py", delete=False) as source_file:
-            source_file.write("from module import my_function\n")
-            source_path = Path(source_file.name)
+        source_path = tmp_path / "module.py"
+        source_path.write_text("from module import my_function\n")
 
-        try:
-            artifact_info = {"type": "function", "name": "my_function"}
-            workspace_root = source_path.parent
+        artifact_info = {"type": "function", "name": "my_function"}
 
-            result = handler._find_artifact_references_in_source(
-                source_path, "my_function", artifact_info, workspace_root
-            )
+        result = handler._find_artifact_references_in_source(
+            source_path, "my_function", artifact_info, tmp_path
+        )
 
-            assert isinstance(result, list)
-        finally:
-            source_path.unlink()
+        assert isinstance(result, list)
+
+
+class TestWorkspaceIndex:
+    """Test the _WorkspaceIndex directory index."""
+
+    def test_indexes_files_and_prunes_skipped_dirs(self, tmp_path: Path) -> None:
+        """_WorkspaceIndex should list nested files but skip excluded directories."""
+        (tmp_path / "pkg" / "sub").mkdir(parents=True)
+        (tmp_path / "pkg" / "sub" / "module.py").write_text("")
+        (tmp_path / "pkg" / "task.manifest.json").write_text("{}")
+        (tmp_path / "top.py").write_text("")
+        (tmp_path / "notes.txt").write_text("")
+        (tmp_path / "tests").mkdir()
+        (tmp_path / "tests" / "test_module.py").write_text("")
+        (tmp_path / "link").symlink_to(tmp_path / "pkg")
+
+        index = _WorkspaceIndex(tmp_path, frozenset({"tests"}))
+        assert index.refresh() is True
+
+        assert {Path(path).relative_to(tmp_path).as_posix() for path in index.sources()} == {
+            "top.py",
+            "pkg/sub/module.py",
+        }
+        assert [Path(path) for path in index.manifests()] == [tmp_path / "pkg/task.manifest.json"]
+
+    def test_relists_only_changed_directories(self, tmp_path: Path) -> None:
+        """_WorkspaceIndex.refresh should list a directory again only when it changed."""
+        (tmp_path / "a").mkdir()
+        (tmp_path / "b").mkdir()
+        (tmp_path / "a" / "one.py").write_text("")
+        old = 1_000_000_000
+        for directory in (tmp_path, tmp_path / "a", tmp_path / "b"):
+            os.utime(directory, ns=(old, old))
+
+        index = _WorkspaceIndex(tmp_path)
+        index.refresh()
+        with patch(
+            "maid_lsp.capabilities.references._scan_directory",
+            wraps=references_module._scan_directory,
+        ) as scan:
+            assert index.refresh() is False
+            assert scan.call_count == 0
+
+            (tmp_path / "b" / "two.py").write_text("")
+            assert index.refresh() is True
+            assert [call.args[0] for call in scan.call_args_list] == [str(tmp_path / "b")]
+
+        assert sorted(Path(path).name for path in index.sources()) == ["one.py", "two.py"]
+
+    def test_missing_root_indexes_nothing(self, tmp_path: Path) -> None:
+        """_WorkspaceIndex should tolerate a root that doesn't exist."""
+        index = _WorkspaceIndex(tmp_path / "missing")
+        index.refresh()
+        assert list(index.sources()) == []
+
+
+class TestReferencesHandlerScanWorkspace:
+    """Test ReferencesHandler._scan_workspace method."""
+
+    def test_collects_manifests_and_sources_in_one_walk(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """_scan_workspace should return matching manifests and non-test sources."""
+        files = {
+            "manifests/task-001.manifest.json": '{"name": "my_function"}',
+            "manifests/task-002.manifest.json": '{"name": "other"}',
+            "src/pkg/module.py": "def my_function(): ...\n",
+            "src/pkg/empty.py": "",
+            "src/pkg/tests/test_module.py": "my_function()\n",
+            "scripts/tool.py": "my_function()\n",
+            ".git/stale.manifest.json": '{"name": "my_function"}',
+            ".tox/py311/stale.manifest.json": '{"name": "my_function"}',
+            "dist/task-001.manifest.json": '{"name": "my_function"}',
+        }
+        for relative, content in files.items():
+            path = tmp_path / relative
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content)
+        monkeypatch.chdir(tmp_path)
+
+        handler = ReferencesHandler()
+        workspace_files = handler._scan_workspace("my_function")
+
+        assert workspace_files.manifests == [tmp_path / "manifests/task-001.manifest.json"]
+        assert workspace_files.sources == [tmp_path / "src/pkg/module.py"]
+
+    def test_finds_name_past_first_64kb(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """_scan_workspace should match names anywhere in large source files."""
+        source_path = tmp_path / "src" / "big.py"
+        source_path.parent.mkdir()
+        source_path.write_text("# filler\n" * 10000 + "my_function()\n")
+        monkeypatch.chdir(tmp_path)
+
+        workspace_files = ReferencesHandler()._scan_workspace("my_function")
+
+        assert workspace_files.sources == [source_path]
+
+    def test_sees_workspace_changes_without_a_cache_clear(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """_scan_workspace should pick up edited, created and deleted files."""
+        manifest_dir = tmp_path / "manifests"
+        manifest_dir.mkdir()
+        (manifest_dir / "task-001.manifest.json").write_text('{"name": "my_function"}')
+        monkeypatch.chdir(tmp_path)
+
+        handler = ReferencesHandler()
+        assert len(handler._scan_workspace("my_function").manifests) == 1
+
+        (manifest_dir / "task-001.manifest.json").write_text('{"name": "other"}')
+        (manifest_dir / "task-002.manifest.json").write_text('{"name": "my_function"}')
+        assert handler._scan_workspace("my_function").manifests == [
+            manifest_dir / "task-002.manifest.json"
+        ]
+
+        (manifest_dir / "task-002.manifest.json").unlink()
+        handler.clear_workspace_cache()
+        assert handler._scan_workspace("my_function").manifests == []
+
+    async def test_scan_files_parallel_keeps_path_order(self) -> None:
+        """_scan_files_parallel should return results in the order of the paths."""
+        handler = ReferencesHandler()
+        paths = [Path(f"/project/file_{i}.py") for i in range(10)]
+
+        def scan(path: Path) -> list[Location]:
+            position = Position(line=0, character=0)
+            return [Location(uri=f"file://{path}", range=Range(start=position, end=position))]
+
+        result = await handler._scan_files_parallel(paths, scan)
+
+        assert [location.uri for location in result] == [f"file://{path}" for path in paths]
+
+
+class TestReferencesHandlerFileCache:
+    """Test the per-version manifest and source caches."""
+
+    def test_reuses_definition_types_until_file_changes(self, tmp_path: Path) -> None:
+        """Source definitions should be looked up again only after the file is modified."""
+        handler = ReferencesHandler()
+        source_path = tmp_path / "module.py"
+        source_path.write_text("def my_function():\n    pass\n")
+        os.utime(source_path, ns=(1_000_000_000, 1_000_000_000))
+
+        first = handler._get_artifact_info_from_source(source_path, "my_function")
+        hits = _definition_types_cached.cache_info().hits
+        assert handler._get_artifact_info_from_source(source_path, "other") is None
+        assert _definition_types_cached.cache_info().hits == hits + 1
+
+        source_path.write_text("class my_function:\n    pass\n")
+        os.utime(source_path, ns=(2_000_000_000, 2_000_000_000))
+        changed = handler._get_artifact_info_from_source(source_path, "my_function")
+        assert first is not None and first["type"] == "function"
+        assert changed is not None and changed["type"] == "class"
+
+    def test_load_manifest_handles_invalid_json(self, tmp_path: Path) -> None:
+        """_load_manifest should return None for unreadable or invalid manifests."""
+        handler = ReferencesHandler()
+        manifest_path = tmp_path / "task.manifest.json"
+        manifest_path.write_text('{"name": "my_function",\n')
+
+        assert handler._load_manifest(manifest_path) is None
+        assert handler._load_manifest(tmp_path / "missing.manifest.json") is None
+
+        manifest_path.write_text('{"name": "my_function"}\n')
+        assert handler._load_manifest(manifest_path) == {"name": "my_function"}
 
 
 class TestReferencesHandlerUtilityMethods:
     """Test ReferencesHandler utility methods."""
 
+    def test_deduplicate_locations_keeps_first_occurrences(self) -> None:
+        """_deduplicate_locations should keep the first of each location, in order."""
+
+        def location(uri: str, line: int, character: int, end: int) -> Location:
+            return Location(
+                uri=uri,
+                range=Range(
+                    start=Position(line=line, character=character),
+                    end=Position(line=line, character=end),
+                ),
+            )
+
+        locations = [
+            location("file:///b.py", 1, 0, 3),
+            location("file:///a.py", 0, 4, 7),
+            location("file:///b.py", 1, 0, 9),
+            location("file:///a.py", 2, 0, 3),
+            location("file:///a.py", 0, 4, 5),
+        ]
+
+        result = ReferencesHandler()._deduplicate_locations(locations)
+
+        assert result == [locations[0], locations[1], locations[3]]
+        assert ReferencesHandler()._deduplicate_locations([]) == []
+
+    def test_get_source_dirs_follows_pyproject_changes(self, tmp_path: Path) -> None:
+        """_get_source_dirs should pick up a renamed project in pyproject.toml."""
+        handler = ReferencesHandler()
+        (tmp_path / "first_pkg").mkdir()
+        (tmp_path / "second_pkg").mkdir()
+        pyproject = tmp_path / "pyproject.toml"
+        pyproject.write_text('[project]\nname = "first-pkg"\n')
+
+        assert handler._get_source_dirs(tmp_path) == [tmp_path / "first_pkg"]
+
+        pyproject.write_text('[project]\nname = "second-pkg-renamed"\n')
+        assert handler._get_source_dirs(tmp_path) == [tmp_path]
+
+        pyproject.write_text("not = [valid toml\n")
+        assert handler._get_source_dirs(tmp_path) == [tmp_path]
+
     def test_get_word_at_position(self) -> None:
         """_get_word_at_position should extract word correctly."""
         handler = ReferencesHandler()
@@ -207,6 +591,51 @@ class TestReferencesHandlerUtilityMethods:
 
         assert word == "my_function"
 
+    def test_get_word_at_position_boundaries(self) -> None:
+        """_get_word_at_position should honor word edges and skip leading digits."""
+        handler = ReferencesHandler()
+
+        document = MagicMock(spec=TextDocument)
+        document.source = "x = 1abc + foo_bar()"
+        document.lines = [document.source]
+
+        def word_at(character: int) -> str | None:
+            return handler._get_word_at_position(document, Position(line=0, character=character))
+
+        assert word_at(0) == "x"
+        assert word_at(1) == "x"
+        assert word_at(2) is None
+        assert word_at(4) is None
+        assert word_at(5) == "abc"
+        assert word_at(18) == "foo_bar"
+        assert word_at(19) is None
+
+    def test_get_word_at_position_on_crlf_lines(self) -> None:
+        """_get_word_at_position should read later lines without their terminator."""
+        handler = ReferencesHandler()
+
+        document = MagicMock(spec=TextDocument)
+        document.source = "import os\r\nvalue = my_function\r\n"
+
+        assert handler._get_word_at_position(document, Position(line=1, character=19)) == (
+            "my_function"
+        )
+        assert handler._get_word_at_position(document, Position(line=1, character=20)) is None
+        assert handler._get_word_at_position(document, Position(line=3, character=0)) is None
+
+    def test_get_word_at_position_on_last_line(self) -> None:
+        """_get_word_at_position should read a final line that has no terminator."""
+        handler = ReferencesHandler()
+
+        document = MagicMock(spec=TextDocument)
+        document.source = "first\n\nlast_word"
+
+        assert handler._get_word_at_position(document, Position(line=2, character=4)) == (
+            "last_word"
+        )
+        assert handler._get_word_at_position(document, Position(line=1, character=0)) is None
+        assert handler._get_word_at_position(document, Position(line=3, character=0)) is None
+
     def test_get_artifact_info_from_manifest(self) -> None:
         """_get_artifact_info_from_manifest should extract artifact info."""
         handler = ReferencesHandler()
@@ -226,21 +655,51 @@ class TestReferencesHandlerUtilityMethods:
         assert artifact_info is not None
         assert artifact_info["name"] == "my_function"
 
-    def test_get_artifact_info_from_source(self) -> None:
+    def test_get_artifact_info_from_source(self, tmp_path: Path) -> None:
         """_get_artifact_info_from_source should extract artifact info."""
         handler = ReferencesHandler()
 
-        with NamedTemporaryFile(mode="w", suffix=".py", delete=False) as source_file:
-            source_file.write("def my_function():\n    pass\n")
-            source_path = Path(source_file.name)
+        source_path = tmp_path / "module.py"
+        source_path.write_text("def my_function():\n    pass\n")
+
+        artifact_info = handler._get_artifact_info_from_source(source_path, "my_function")
+
+        assert artifact_info is not None
+        assert artifact_info["type"] == "function"
+
+    def test_get_artifact_info_from_source_scopes(self, tmp_path: Path) -> None:
+        """_get_artifact_info_from_source should find definitions in any statement block."""
+        handler = ReferencesHandler()
+        source_path = tmp_path / "module.py"
+        source_path.write_text(
+            "import sys\n"
+            "if sys.version_info >= (3, 11):\n"
+            "    VERSION = 11\n"
+            "class MyClass:\n"
+            "    async def my_method(self):\n"
+            "        local_value = 1\n"
+            "        def nested_function():\n"
+            "            class NestedClass:\n"
+            "                pass\n"
+            "try:\n"
+            "    import fast\n"
+            "except ImportError:\n"
+            "    FALLBACK = None\n"
+            "HANDLERS = [lambda: None for _ in range(2)]\n"
+        )
 
-        try:
-            artifact_info = handler._get_artifact_info_from_source(source_path, "my_function")
+        def info_type(name: str) -> str | None:
+            info = handler._get_artifact_info_from_source(source_path, name)
+            return info["type"] if info else None
 
-            assert artifact_info is not None
-            assert artifact_info["type"] == "function"
-        finally:
-            source_path.unlink()
+        assert info_type("VERSION") == "attribute"
+        assert info_type("MyClass") == "class"
+        assert info_type("my_method") == "function"
+        assert info_type("local_value") == "attribute"
+        assert info_type("nested_function") == "function"
+        assert info_type("NestedClass") == "class"
+        assert info_type("FALLBACK") == "attribute"
+        assert info_type("_") is None
 
     def test_is_manifest_file(self) -> None:
         """_is_manifest_file should identify manifest files correctly."""
@@ -249,6 +708,9 @@ class TestReferencesHandlerUtilityMethods:
         assert handler._is_manifest_file(Path("task-001.manifest.json")) is True
         assert handler._is_manifest_file(Path("manifests/task.json")) is True
         assert handler._is_manifest_file(Path("src/module.py")) is False
+        assert handler._is_manifest_file(Path("/project/manifests/task.json")) is True
+        assert handler._is_manifest_file(Path("/project/manifests_old/task.json")) is False
+        assert handler._is_manifest_file(Path("/project/manifests/notes.txt")) is False
 
     def test_uri_to_path(self) -> None:
         """_uri_to_path should convert URI to Path correctly."""
@@ -264,46 +726,82 @@ class TestReferencesHandlerUtilityMethods:
         uri = handler._path_to_uri(Path("/path/to/file.py"))
         assert uri.startswith("file://")
 
+    def test_path_to_uri_does_not_resolve(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """_path_to_uri should build absolute URIs without resolving symlinks."""
+        handler = ReferencesHandler()
+        monkeypatch.chdir("/")
+
+        with patch.object(Path, "resolve", autospec=True) as resolve:
+            absolute = handler._path_to_uri(Path("/path/to/../to/unresolved.py"))
+            relative = handler._path_to_uri(Path("path/to/relative.py"))
+
+        assert absolute == "file:///path/to/unresolved.py"
+        assert relative == "file:///path/to/relative.py"
+        resolve.assert_not_called()
+
+    def test_path_to_uri_matches_definition_handler(self) -> None:
+        """References and definitions should return the same URI for a file."""
+        path = Path("/path/my project/../my project/file#1.py")
+
+        uri = ReferencesHandler()._path_to_uri(path)
+
+        assert uri == "file:///path/my%20project/file%231.py"
+        assert uri == DefinitionHandler()._path_to_uri(path)
+
 
 class TestReferencesHandlerExtractTestFiles:
     """Test ReferencesHandler._extract_test_files_from_command method."""
 
-    def test_extracts_test_file_from_pytest_command(self) -> None:
+    def test_lists_each_directory_once(self, tmp_path: Path) -> None:
+        """Tokens in the same directory should be answered from one listing."""
+        handler = ReferencesHandler()
+        tests_dir = tmp_path / "tests"
+        (tests_dir / "test_dir.py").mkdir(parents=True)
+        (tests_dir / "test_a.py").write_text("")
+        (tests_dir / "test_b.py").write_text("")
+        dir_listings: dict[str, dict[str, bool]] = {}
+
+        command = ["pytest", "tests/test_a.py", "tests/test_missing.py", "tests/test_*.py"]
+        result = handler._extract_test_files_from_command(command, tmp_path, dir_listings)
+
+        test_a, test_b = (tests_dir / "test_a.py").resolve(), (tests_dir / "test_b.py").resolve()
+        assert sorted(result) == [test_a, test_a, test_b]
+        assert list(dir_listings) == [str(tests_dir)]
+
+    def test_extracts_test_file_from_pytest_command(self, tmp_path: Path) -> None:
         """_extract_test_files_from_command should extract test file from pytest command."""
         handler = ReferencesHandler()
 
-        with TemporaryDirectory() as tmpdir:
-            test_file = Path(tmpdir) / "tests" / "test_example.py"
-            test_file.parent.mkdir()
-            test_file.write_text("# test file\n")
+        test_file = tmp_path / "tests" / "test_example.py"
+        test_file.parent.mkdir()
+        test_file.write_text("# test file\n")
 
-            validation_command = ["pytest", "tests/test_example.py", "-v"]
-            workspace_root = Path(tmpdir)
+        validation_command = ["pytest", "tests/test_example.py", "-v"]
+        workspace_root = tmp_path
 
-            result = handler._extract_test_files_from_command(validation_command, workspace_root)
+        result = handler._extract_test_files_from_command(validation_command, workspace_root)
 
-            assert len(result) == 1
-            assert result[0] == test_file.resolve()
+        assert len(result) == 1
+        assert result[0] == test_file.resolve()
 
-    def test_extracts_test_file_with_glob_pattern(self) -> None:
+    def test_extracts_test_file_with_glob_pattern(self, tmp_path: Path) -> None:
         """_extract_test_files_from_command should handle glob patterns."""
         handler = ReferencesHandler()
 
-        with TemporaryDirectory() as tmpdir:
-            tests_dir = Path(tmpdir) / "tests"
-            tests_dir.mkdir()
-            test_file1 = tests_dir / "test_one.py"
-            test_file2 = tests_dir / "test_two.py"
-            test_file1.write_text("# test file 1\n")
-            test_file2.write_text("# test file 2\n")
+        tests_dir = tmp_path / "tests"
+        tests_dir.mkdir()
+        test_file1 = tests_dir / "test_one.py"
+        test_file2 = tests_dir / "test_two.py"
+        test_file1.write_text("# test file 1\n")
+        test_file2.write_text("# test file 2\n")
 
-            validation_command = ["pytest", "tests/test_*.py", "-v"]
-            workspace_root = Path(tmpdir)
+        validation_command = ["pytest", "tests/test_*.py", "-v"]
+        workspace_root = tmp_path
 
-            result = handler._extract_test_files_from_command(validation_command, workspace_root)
+        result = handler._extract_test_files_from_command(validation_command, workspace_root)
 
-            assert len(result) >= 1
-            assert all(f.exists() for f in result)
+        assert len(result) >= 1
+        assert all(f.exists() for f in result)
 
     def test_skips_non_test_arguments(self) -> None:
         """_extract_test_files_from_command should skip command names and flags."""
@@ -338,52 +836,81 @@ class TestReferencesHandlerFindInTests:
     """Test ReferencesHandler._find_in_tests method with validationCommand."""
 
     @pytest.mark.asyncio
-    async def test_uses_validation_command_from_manifest(self) -> None:
+    async def test_uses_validation_command_from_manifest(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
         """_find_in_tests should use validationCommand from current manifest."""
         handler = ReferencesHandler()
 
-        with TemporaryDirectory() as tmpdir:
-            manifest_dir = Path(tmpdir) / "manifests"
-            manifest_dir.mkdir()
-            tests_dir = Path(tmpdir) / "tests"
-            tests_dir.mkdir()
+        manifest_dir = tmp_path / "manifests"
+        manifest_dir.mkdir()
+        tests_dir = tmp_path / "tests"
+        tests_dir.mkdir()
+
+        # Create test file
+        test_file = tests_dir / "test_task_001.py"
+        test_file.write_text(
+            "def test_my_function():\n    from src.module import my_function\n    assert my_function() is not None\n"
+        )
+
+        # Create manifest with validationCommand
+        manifest_content = {
+            "goal": "Test",
+            "expectedArtifacts": {
+                "file": "src/module.py",
+                "contains": [{"type": "function", "name": "my_function"}],
+            },
+            "validationCommand": ["pytest", "tests/test_task_001.py", "-v"],
+        }
+
+        manifest_json = json.dumps(manifest_content)
+        manifest_path = manifest_dir / "task-001.manifest.json"
+        manifest_path.write_text(manifest_json)
+
+        document = MagicMock(spec=TextDocument)
+        document.source = manifest_json
+        document.lines = document.source.split("\n")
 
-            # Create test file
-            test_file = tests_dir / "test_task_001.py"
-            test_file.write_text(
-                "def test_my_function():\n    from src.module import my_function\n    assert my_function() is not None\n"
+        artifact_info = {"type": "function", "name": "my_function"}
+
+        monkeypatch.chdir(tmp_path)
+        result = await handler._find_in_tests("my_function", artifact_info, document, manifest_path)
+        assert isinstance(result, list)
+        # Should find references in the test file from validationCommand
+        assert len(result) > 0
+
+    async def test_uses_only_manifests_declaring_the_artifact(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """_find_in_tests from a source file should follow manifests that declare the name."""
+        (tmp_path / "manifests").mkdir()
+        (tmp_path / "tests").mkdir()
+        for name in ("declared", "mentioned"):
+            (tmp_path / "tests" / f"test_{name}.py").write_text("my_function()\n")
+        (tmp_path / "manifests" / "task-001.manifest.json").write_text(
+            json.dumps(
+                {
+                    "expectedArtifacts": {"contains": [{"name": "my_function"}]},
+                    "validationCommand": ["pytest", "tests/test_declared.py"],
+                }
             )
+        )
+        (tmp_path / "manifests" / "task-002.manifest.json").write_text(
+            json.dumps(
+                {
+                    "description": "calls my_function",
+                    "validationCommand": ["pytest", "tests/test_mentioned.py"],
+                }
+            )
+        )
+        monkeypatch.chdir(tmp_path)
 
-            # Create manifest with validationCommand
-            manifest_content = {
-                "goal": "Test",
-                "expectedArtifacts": {
-                    "file": "src/module.py",
-                    "contains": [{"type": "function", "name": "my_function"}],
-                },
-                "validationCommand": ["pytest", "tests/test_task_001.py", "-v"],
-            }
+        document = MagicMock(spec=TextDocument)
+        document.source = "def my_function(): ...\n"
+        result = await ReferencesHandler()._find_in_tests(
+            "my_function", {"type": "function"}, document, tmp_path / "src" / "module.py"
+        )
 
-            manifest_path = manifest_dir / "task-001.manifest.json"
-            with open(manifest_path, "w") as f:
-                json.dump(manifest_content, f)
-
-            document = MagicMock(spec=TextDocument)
-            document.source = json.dumps(manifest_content)
-            document.lines = document.source.split("\n")
-
-            artifact_info = {"type": "function", "name": "my_function"}
-
-            import os
-
-            original_cwd = os.getcwd()
-            try:
-                os.chdir(tmpdir)
-                result = await handler._find_in_tests(
-                    "my_function", artifact_info, document, manifest_path
-                )
-                assert isinstance(result, list)
-                # Should find references in the test file from validationCommand
-                assert len(result) > 0
-            finally:
-                os.chdir(original_cwd)
+        assert [location.uri for location in result] == [
+            f"file://{tmp_path / 'tests' / 'test_declared.py'}"
+        ]